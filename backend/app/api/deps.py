@@ -1,11 +1,16 @@
 # app/api/deps.py (Debug Version)
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import jwt
-from typing import Dict
+from pydantic import BaseModel, ValidationError
+from typing import Dict, List, Type, TypeVar
 import logging
 from app.core.config import settings
+from app.core.deadlines import deadline_exceeded, remaining_seconds
+from app.db.consistency import CONSISTENCY_HEADER, DbHandles, apply_consistency_token, last_write_token
+from app.db.mongodb import get_client, get_db, get_read_db
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -13,12 +18,39 @@ logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class DeadlineAwareJWKClient(jwt.PyJWKClient):
+    """
+    PyJWKClient whose fetch timeout is the smaller of the configured limit
+    and the budget left for the current request.
+    """
+
+    @property
+    def timeout(self):
+        remaining = remaining_seconds()
+        if remaining is None:
+            return self._max_timeout
+        return max(min(self._max_timeout, remaining), 0.001)
+
+    @timeout.setter
+    def timeout(self, value):
+        self._max_timeout = value
+
+
+_jwks_client = None
+
 
 def get_jwks_client():
+    global _jwks_client
     try:
-        jwks_url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
-        logger.debug(f"JWKS URL: {jwks_url}")
-        return jwt.PyJWKClient(jwks_url)
+        # Reused across requests so the fetched key set stays cached
+        if _jwks_client is None:
+            jwks_url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
+            logger.debug(f"JWKS URL: {jwks_url}")
+            _jwks_client = DeadlineAwareJWKClient(jwks_url, timeout=settings.JWKS_FETCH_TIMEOUT_SECONDS)
+        return _jwks_client
     except Exception as e:
         logger.error(f"Failed to fetch JWKS: {e}")
         raise HTTPException(
@@ -52,6 +84,8 @@ def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(securi
             logger.debug(f"Signing key obtained: {type(signing_key.key)}")
         except Exception as e:
             logger.error(f"Error getting signing key: {e}")
+            if deadline_exceeded():
+                raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Request deadline exceeded")
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not get signing key")
 
         # Log settings for debugging
@@ -95,6 +129,8 @@ def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(securi
         logger.debug("Token validation successful!")
         return payload
 
+    except HTTPException:
+        raise
     except jwt.ExpiredSignatureError:
         logger.error("Token has expired")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
@@ -115,9 +151,8 @@ def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(securi
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Could not validate credentials: {e}")
 
 
-def check_homeowner_role(payload: Dict = Depends(get_token_payload)):
-    logger.debug("Checking homeowner role...")
-
+def get_user_roles(payload: Dict) -> List[str]:
+    """Returns the roles listed in the token, whichever claim key Auth0 used."""
     # Try multiple possible roles claim keys
     possible_roles_claims = [
         f"{settings.AUTH0_API_AUDIENCE}/roles",  # Using API audience as namespace
@@ -137,8 +172,13 @@ def check_homeowner_role(payload: Dict = Depends(get_token_payload)):
     logger.debug(f"Tried roles claim keys: {possible_roles_claims}")
     logger.debug(f"Roles claim used: {roles_claim_used}")
     logger.debug(f"User roles: {user_roles}")
+    return user_roles
+
 
-    if "homeowner" not in user_roles:
+def check_homeowner_role(payload: Dict = Depends(get_token_payload)):
+    logger.debug("Checking homeowner role...")
+
+    if "homeowner" not in get_user_roles(payload):
         logger.error("User does not have homeowner role")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -146,4 +186,104 @@ def check_homeowner_role(payload: Dict = Depends(get_token_payload)):
         )
 
     logger.debug("Homeowner role check passed!")
-    return payload
\ No newline at end of file
+    return payload
+
+
+def check_contractor_role(payload: Dict = Depends(get_token_payload)):
+    logger.debug("Checking contractor role...")
+
+    if "contractor" not in get_user_roles(payload):
+        logger.error("User does not have contractor role")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have the required role to access this resource."
+        )
+
+    logger.debug("Contractor role check passed!")
+    return payload
+
+
+def check_official_role(payload: Dict = Depends(get_token_payload)):
+    logger.debug("Checking city official role...")
+
+    if "city_official" not in get_user_roles(payload):
+        logger.error("User does not have city_official role")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have the required role to access this resource."
+        )
+
+    logger.debug("City official role check passed!")
+    return payload
+
+
+def validated_body(model: Type[ModelT]):
+    """
+    Builds a dependency that validates the raw request bytes with
+    `model.model_validate_json`, so JSON parsing and validation run in a
+    single pydantic-core pass. Failures surface as the standard FastAPI 422.
+    """
+    async def dependency(request: Request) -> ModelT:
+        raw_body = await request.body()
+        try:
+            return model.model_validate_json(raw_body)
+        except ValidationError as e:
+            errors = []
+            for error in e.errors(include_url=False):
+                error = {**error, "loc": ("body", *error["loc"])}
+                if error["type"] == "json_invalid":
+                    # `input` is the whole raw body, possibly not even UTF-8; don't echo it
+                    error.pop("input", None)
+                errors.append(error)
+            raise RequestValidationError(errors, body=raw_body)
+
+    return dependency
+
+
+def _inline_refs(schema, defs: Dict):
+    if isinstance(schema, dict):
+        ref = schema.get("$ref", "")
+        if ref.startswith("#/$defs/"):
+            return _inline_refs(defs[ref.split("/")[-1]], defs)
+        return {key: _inline_refs(value, defs) for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [_inline_refs(item, defs) for item in schema]
+    return schema
+
+
+def body_schema(model: Type[BaseModel]) -> Dict:
+    """OpenAPI `requestBody` for routes that read their body via `validated_body`."""
+    schema = model.model_json_schema()
+    # `#/$defs/...` refs would not resolve inside the OpenAPI document
+    schema = _inline_refs(schema, schema.pop("$defs", {}))
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
+
+
+async def get_db_handles(
+        request: Request,
+        response: Response,
+        payload: Dict = Depends(get_token_payload)
+):
+    """
+    FastAPI dependency providing separate read and write handles bound to a
+    causally consistent session. The session is advanced to the caller's last
+    write (from the X-Consistency-Token header, else remembered per user), so
+    secondary reads never miss it.
+    """
+    user_id = payload.get("sub")
+    async with await get_client().start_session(causal_consistency=True) as session:
+        token = request.headers.get(CONSISTENCY_HEADER) or last_write_token(user_id)
+        if token:
+            apply_consistency_token(session, token)
+        yield DbHandles(
+            read=get_read_db(),
+            write=get_db(),
+            session=session,
+            response=response,
+            user_id=user_id,
+        )
@@ -0,0 +1,122 @@
+# backend/app/api/endpoints/contractor.py
+from fastapi import APIRouter, Depends, status, HTTPException, Query
+from typing import Optional, Tuple
+from pymongo.errors import PyMongoError
+import base64
+import logging
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from app.api.deps import check_contractor_role
+from app.api.utils import database_error
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.deadlines import DeadlineRoute
+from app.db.indexes import FEED_SORT
+from app.db.mongodb import get_read_db
+from app.models.maintenance import MaintenanceCategory, MaintenanceStatus, OpenRequestFeedPage
+
+# Set up logging
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/contractor",
+    tags=["contractor"],
+    dependencies=[Depends(check_contractor_role)],
+    route_class=DeadlineRoute,
+)
+
+# Fields contractors see in the feed (see OpenRequestOut)
+FEED_PROJECTION = {
+    "title": 1,
+    "description": 1,
+    "category": 1,
+    "service_area": 1,
+    "created_at": 1,
+    "image_url": 1,
+}
+
+# Hot feed pages are shared by every contractor with the same filters
+_feed_cache = TTLCache(
+    ttl_seconds=settings.CONTRACTOR_FEED_CACHE_TTL_SECONDS,
+    max_entries=settings.CONTRACTOR_FEED_CACHE_MAX_ENTRIES,
+)
+
+
+def encode_cursor(doc: dict) -> str:
+    """Encodes the sort key of the last document on a page."""
+    raw = f"{doc['created_at'].isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        created_at, object_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), ObjectId(object_id)
+    except (ValueError, InvalidId, UnicodeDecodeError) as e:
+        logger.error(f"Invalid feed cursor '{cursor}': {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@router.get("/requests/open", response_model=OpenRequestFeedPage)
+async def get_open_requests_feed(
+        category: Optional[MaintenanceCategory] = None,
+        service_area: Optional[str] = Query(None, max_length=50),
+        cursor: Optional[str] = None,
+        limit: int = Query(settings.CONTRACTOR_FEED_DEFAULT_LIMIT, ge=1, le=settings.CONTRACTOR_FEED_MAX_LIMIT),
+        db=Depends(get_read_db),
+):
+    """
+    Lists open maintenance requests, newest first, for contractors to browse.
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
+    """
+    try:
+        if service_area is not None:
+            service_area = service_area.strip().lower() or None
+
+        cache_key = (category.value if category else None, service_area, cursor, limit)
+        cached_page = _feed_cache.get(cache_key)
+        if cached_page is not None:
+            logger.debug(f"Feed cache hit: {cache_key}")
+            return cached_page
+
+        # `status: open` must stay in the filter so the partial indexes apply
+        query = {"status": MaintenanceStatus.OPEN.value}
+        if category:
+            query["category"] = category.value
+        if service_area:
+            query["service_area"] = service_area
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor)
+            query["created_at"] = {"$lte": last_created_at}
+            query["$or"] = [
+                {"created_at": {"$lt": last_created_at}},
+                {"created_at": last_created_at, "_id": {"$lt": last_id}},
+            ]
+
+        logger.debug(f"Feed query: {query}")
+        # Fetch one extra document to know whether another page exists
+        feed_cursor = db["requests"].find(query, FEED_PROJECTION).sort(FEED_SORT).limit(limit + 1)
+        docs = await feed_cursor.to_list(length=limit + 1)
+
+        page = {"items": docs[:limit], "next_cursor": None}
+        if len(docs) > limit:
+            page["next_cursor"] = encode_cursor(docs[limit - 1])
+
+        _feed_cache.set(cache_key, page)
+        return page
+
+    except HTTPException:
+        raise
+    except PyMongoError as e:
+        logger.error(f"Database error: {e}")
+        raise database_error(e)
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        logger.exception("Full traceback:")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
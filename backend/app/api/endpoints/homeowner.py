@@ -1,41 +1,37 @@
 # backend/app/api/endpoints/homeowner.py
-from fastapi import APIRouter, Depends, status, HTTPException, Request
-from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, status, HTTPException
+from typing import Dict, List
 from pymongo.errors import PyMongoError
 import logging
 from bson import ObjectId
 from datetime import datetime
-from app.api.deps import check_homeowner_role
+from app.api.deps import body_schema, check_homeowner_role, get_db_handles, validated_body
+from app.api.utils import database_error
+from app.core.deadlines import DeadlineRoute
+from app.db.batching import insert_document
+from app.db.consistency import DbHandles
 from app.db.mongodb import get_db
-from app.models.maintenance import MaintenanceRequest, MaintenanceRequestUpdate, MaintenanceStatus
-import json
+from app.models.maintenance import (
+    ACTIVE_STATUSES,
+    MaintenanceRequest,
+    MaintenanceRequestCreate,
+    MaintenanceRequestOut,
+    MaintenanceRequestUpdate,
+)
+from app.services.archival import ARCHIVE_COLLECTION
+from app.services.notifications import NOTIFY_PENDING
+from app.services.rollups import mark_months_changed
 
 # Set up logging
 logger = logging.getLogger(__name__)
 router = APIRouter(
     prefix="/homeowner",
     tags=["homeowner"],
-    dependencies=[Depends(check_homeowner_role)]
+    dependencies=[Depends(check_homeowner_role)],
+    route_class=DeadlineRoute,
 )
 
 
-def serialize_mongo_doc(doc):
-    """Convert MongoDB document to JSON-serializable format"""
-    if doc is None:
-        return None
-    # Convert ObjectId to string
-    if "_id" in doc:
-        doc["id"] = str(doc["_id"])
-        del doc["_id"]  # Remove the original _id field
-    # Convert any other ObjectId fields
-    for key, value in doc.items():
-        if isinstance(value, ObjectId):
-            doc[key] = str(value)
-        elif isinstance(value, datetime):
-            doc[key] = value.isoformat()
-    return doc
-
-
 @router.get("/debug/requests")
 async def debug_requests(
         db=Depends(get_db),
@@ -76,13 +72,17 @@ async def debug_requests(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/requests")
+@router.get("/requests", response_model=List[MaintenanceRequestOut])
 async def get_all_requests_for_homeowner(
-        db=Depends(get_db),
+        active_only: bool = False,
+        include_archived: bool = False,
+        db: DbHandles = Depends(get_db_handles),
         payload: Dict = Depends(check_homeowner_role)
 ):
     """
     Retrieves all maintenance requests submitted by the authenticated homeowner.
+    `active_only` limits the list to open and in-progress requests;
+    `include_archived` adds old completed/canceled requests from the archive.
     """
     try:
         logger.debug("Starting get_all_requests_for_homeowner")
@@ -97,31 +97,32 @@ async def get_all_requests_for_homeowner(
 
         # Query the database
         logger.debug("Querying requests collection...")
-        requests_cursor = db["requests"].find({"homeowner_id": user_id})
+        query = {"homeowner_id": user_id}
+        if active_only:
+            # Matches the partial homeowner_active index
+            query["status"] = {"$in": ACTIVE_STATUSES}
+        requests_cursor = db.read["requests"].find(query, session=db.session).sort("created_at", -1)
         requests_list = await requests_cursor.to_list(length=100)
         logger.debug(f"Found {len(requests_list)} requests")
 
-        # Serialize MongoDB documents
-        serialized_requests = []
-        for request_doc in requests_list:
-            logger.debug(
-                f"Processing document with _id: {request_doc.get('_id')} (type: {type(request_doc.get('_id'))})")
-            serialized_request = serialize_mongo_doc(request_doc.copy())
-            logger.debug(
-                f"Serialized to ID: {serialized_request.get('id')} (type: {type(serialized_request.get('id'))})")
-            serialized_requests.append(serialized_request)
+        if include_archived and not active_only:
+            archive_cursor = db.read[ARCHIVE_COLLECTION].find(query, session=db.session).sort("created_at", -1)
+            archived_list = await archive_cursor.to_list(length=100)
+            logger.debug(f"Found {len(archived_list)} archived requests")
+            requests_list = sorted(
+                requests_list + archived_list,
+                key=lambda doc: doc.get("created_at") or datetime.min,
+                reverse=True,
+            )[:100]
 
-        logger.debug(f"Serialized {len(serialized_requests)} requests")
-        return serialized_requests
+        # Serialized through MaintenanceRequestOut by the response model
+        return requests_list
 
     except HTTPException:
         raise
     except PyMongoError as e:
         logger.error(f"Database error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database error: {str(e)}"
-        )
+        raise database_error(e)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         logger.exception("Full traceback:")
@@ -131,14 +132,16 @@ async def get_all_requests_for_homeowner(
         )
 
 
-@router.get("/requests/{request_id}")
+@router.get("/requests/{request_id}", response_model=MaintenanceRequestOut)
 async def get_request_by_id(
         request_id: str,
-        db=Depends(get_db),
+        include_archived: bool = False,
+        db: DbHandles = Depends(get_db_handles),
         payload: Dict = Depends(check_homeowner_role)
 ):
     """
     Retrieves a specific maintenance request by ID for the authenticated homeowner.
+    Archived requests are only searched when `include_archived` is set.
     """
     try:
         logger.debug(f"Getting request with ID: {request_id}")
@@ -162,10 +165,16 @@ async def get_request_by_id(
 
         # Find the request and ensure it belongs to the user
         logger.debug(f"Searching for request with _id={object_id} and homeowner_id={user_id}")
-        request_doc = await db["requests"].find_one({
+        request_doc = await db.write["requests"].find_one({
             "_id": object_id,
             "homeowner_id": user_id
-        })
+        }, session=db.session)
+
+        if not request_doc and include_archived:
+            request_doc = await db.read[ARCHIVE_COLLECTION].find_one({
+                "_id": object_id,
+                "homeowner_id": user_id
+            }, session=db.session)
 
         if not request_doc:
             logger.error(f"Request not found: _id={object_id}, homeowner_id={user_id}")
@@ -174,16 +183,13 @@ async def get_request_by_id(
                 detail="Request not found or you don't have permission to access it"
             )
 
-        return serialize_mongo_doc(request_doc.copy())
+        return request_doc
 
     except HTTPException:
         raise
     except PyMongoError as e:
         logger.error(f"Database error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database error: {str(e)}"
-        )
+        raise database_error(e)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise HTTPException(
@@ -192,25 +198,23 @@ async def get_request_by_id(
         )
 
 
-@router.post("/requests", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/requests",
+    status_code=status.HTTP_201_CREATED,
+    response_model=MaintenanceRequestOut,
+    openapi_extra=body_schema(MaintenanceRequestCreate),
+)
 async def create_maintenance_request(
-        request_data: Request,
-        db=Depends(get_db),
+        request_data: MaintenanceRequestCreate = Depends(validated_body(MaintenanceRequestCreate)),
+        db: DbHandles = Depends(get_db_handles),
         payload: Dict = Depends(check_homeowner_role)
 ):
+    """
+    Creates a maintenance request for the authenticated homeowner.
+    The body is validated by `MaintenanceRequestCreate`.
+    """
     try:
-        logger.debug("=== DEBUG: Starting create_maintenance_request ===")
-
-        # Get raw request body first
-        raw_body = await request_data.body()
-        logger.debug(f"Raw request body: {raw_body}")
-
-        try:
-            json_body = json.loads(raw_body)
-            logger.debug(f"Parsed JSON body: {json_body}")
-        except Exception as e:
-            logger.error(f"Failed to parse JSON: {e}")
-            raise HTTPException(status_code=400, detail="Invalid JSON")
+        logger.debug("Starting create_maintenance_request")
 
         authenticated_user_id = payload.get("sub")
         logger.debug(f"Authenticated user ID: {authenticated_user_id}")
@@ -221,73 +225,36 @@ async def create_maintenance_request(
                 detail="User ID not found in token"
             )
 
-        # Manually validate the required fields
-        title = json_body.get("title")
-        description = json_body.get("description")
-        homeowner_id = json_body.get("homeowner_id")
-
-        logger.debug(f"Title: '{title}' (length: {len(title) if title else 'None'})")
-        logger.debug(f"Description: '{description}' (length: {len(description) if description else 'None'})")
-        logger.debug(f"Homeowner ID: '{homeowner_id}'")
-
-        # Validate title
-        if not title or len(title.strip()) < 3:
-            raise HTTPException(status_code=422, detail="Title must be at least 3 characters long")
-        if len(title.strip()) > 100:
-            raise HTTPException(status_code=422, detail="Title must be at most 100 characters long")
-
-        # Validate description
-        if not description or len(description.strip()) < 5:
-            raise HTTPException(status_code=422, detail="Description must be at least 5 characters long")
-        if len(description.strip()) > 500:
-            raise HTTPException(status_code=422, detail="Description must be at most 500 characters long")
-
-        # Validate homeowner_id
-        if not homeowner_id:
-            raise HTTPException(status_code=422, detail="Homeowner ID is required")
-
-        if authenticated_user_id != homeowner_id:
+        if authenticated_user_id != request_data.homeowner_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You can only create maintenance requests for your own account."
             )
 
-        # Create the document manually
-        request_dict = {
-            "title": title.strip(),
-            "description": description.strip(),
-            "homeowner_id": homeowner_id,
-            "status": MaintenanceStatus.OPEN,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
-            "image_url": json_body.get("image_url"),
-            "bids": []
-        }
+        # The input is already validated, so build the stored document without re-validating
+        now = datetime.utcnow()
+        request_dict = MaintenanceRequest.model_construct(
+            **request_data.model_dump(),
+            created_at=now,
+            updated_at=now,
+        ).model_dump()
+        # Outbox marker, written atomically with the request; the job pool turns it into a job
+        request_dict[NOTIFY_PENDING] = True
 
         logger.debug(f"Final request dict: {request_dict}")
 
-        # Insert into database
-        new_request = await db["requests"].insert_one(request_dict)
-        logger.debug(f"Inserted request with ID: {new_request.inserted_id}")
+        # The insert sets `_id` on request_dict, so no read-back is needed
+        inserted_id = await insert_document(db.write["requests"], request_dict, session=db.session)
+        logger.debug(f"Inserted request with ID: {inserted_id}")
+        db.record_write()
 
-        # Get the created request
-        created_request = await db["requests"].find_one({"_id": new_request.inserted_id})
-        logger.debug(f"Retrieved created request: {created_request}")
-
-        # Serialize the response
-        serialized_request = serialize_mongo_doc(created_request.copy())
-        logger.debug(f"Returning created request: {serialized_request}")
-
-        return serialized_request
+        return request_dict
 
     except HTTPException:
         raise
     except PyMongoError as e:
         logger.error(f"Database error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database error: {str(e)}"
-        )
+        raise database_error(e)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         logger.exception("Full traceback:")
@@ -297,11 +264,15 @@ async def create_maintenance_request(
         )
 
 
-@router.put("/requests/{request_id}")
+@router.put(
+    "/requests/{request_id}",
+    response_model=MaintenanceRequestOut,
+    openapi_extra=body_schema(MaintenanceRequestUpdate),
+)
 async def update_maintenance_request(
         request_id: str,
-        update_data: MaintenanceRequestUpdate,
-        db=Depends(get_db),
+        update_data: MaintenanceRequestUpdate = Depends(validated_body(MaintenanceRequestUpdate)),
+        db: DbHandles = Depends(get_db_handles),
         payload: Dict = Depends(check_homeowner_role)
 ):
     """
@@ -330,10 +301,10 @@ async def update_maintenance_request(
 
         # First, check if the request exists and belongs to the user
         logger.debug(f"Searching for request to update: _id={object_id}, homeowner_id={user_id}")
-        existing_request = await db["requests"].find_one({
+        existing_request = await db.write["requests"].find_one({
             "_id": object_id,
             "homeowner_id": user_id
-        })
+        }, session=db.session)
 
         if not existing_request:
             logger.error(f"Request not found for update: _id={object_id}, homeowner_id={user_id}")
@@ -354,6 +325,10 @@ async def update_maintenance_request(
             update_fields["description"] = update_dict["description"]
         if update_dict.get("status"):
             update_fields["status"] = update_dict["status"]
+        if update_dict.get("category"):
+            update_fields["category"] = update_dict["category"]
+        if update_dict.get("service_area"):
+            update_fields["service_area"] = update_dict["service_area"]
         if update_dict.get("image_url") is not None:  # Allow empty string to clear image
             update_fields["image_url"] = update_dict["image_url"]
 
@@ -369,10 +344,12 @@ async def update_maintenance_request(
         logger.debug(f"Update fields: {update_fields}")
 
         # Update the request
-        result = await db["requests"].update_one(
+        result = await db.write["requests"].update_one(
             {"_id": object_id, "homeowner_id": user_id},
-            {"$set": update_fields}
+            {"$set": update_fields},
+            session=db.session
         )
+        db.record_write()
 
         logger.debug(f"Update result: matched={result.matched_count}, modified={result.modified_count}")
 
@@ -383,17 +360,14 @@ async def update_maintenance_request(
             )
 
         # Get the updated request
-        updated_request = await db["requests"].find_one({"_id": object_id})
-        return serialize_mongo_doc(updated_request.copy())
+        updated_request = await db.write["requests"].find_one({"_id": object_id}, session=db.session)
+        return updated_request
 
     except HTTPException:
         raise
     except PyMongoError as e:
         logger.error(f"Database error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database error: {str(e)}"
-        )
+        raise database_error(e)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise HTTPException(
@@ -405,7 +379,7 @@ async def update_maintenance_request(
 @router.delete("/requests/{request_id}")
 async def delete_maintenance_request(
         request_id: str,
-        db=Depends(get_db),
+        db: DbHandles = Depends(get_db_handles),
         payload: Dict = Depends(check_homeowner_role)
 ):
     """
@@ -433,10 +407,10 @@ async def delete_maintenance_request(
 
         # First, check if the request exists and belongs to the user
         logger.debug(f"Searching for request to delete: _id={object_id}, homeowner_id={user_id}")
-        existing_request = await db["requests"].find_one({
+        existing_request = await db.write["requests"].find_one({
             "_id": object_id,
             "homeowner_id": user_id
-        })
+        }, session=db.session)
 
         if not existing_request:
             logger.error(f"Request not found for deletion: _id={object_id}, homeowner_id={user_id}")
@@ -448,10 +422,11 @@ async def delete_maintenance_request(
         logger.debug(f"Found existing request to delete: {existing_request.get('title')}")
 
         # Delete the request
-        result = await db["requests"].delete_one({
+        result = await db.write["requests"].delete_one({
             "_id": object_id,
             "homeowner_id": user_id
-        })
+        }, session=db.session)
+        db.record_write()
 
         logger.debug(f"Delete result: deleted_count={result.deleted_count}")
 
@@ -461,16 +436,16 @@ async def delete_maintenance_request(
                 detail="Request not found or already deleted"
             )
 
+        # The request leaves no updated_at behind, so tell the analytics rollup directly
+        await mark_months_changed(db.write, [existing_request.get("created_at")], session=db.session)
+
         return {"message": "Request deleted successfully", "deleted_id": request_id}
 
     except HTTPException:
         raise
     except PyMongoError as e:
         logger.error(f"Database error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database error: {str(e)}"
-        )
+        raise database_error(e)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise HTTPException(
@@ -0,0 +1,84 @@
+# backend/app/api/endpoints/official.py
+from fastapi import APIRouter, Depends, status, HTTPException, Query
+from typing import Optional
+from pymongo.errors import PyMongoError
+import logging
+from datetime import datetime
+from app.api.deps import check_official_role
+from app.api.utils import database_error
+from app.core.deadlines import DeadlineRoute
+from app.db.mongodb import get_read_db
+from app.models.analytics import RequestStatsReport
+from app.services.rollups import STATE_COLLECTION, STATE_ID, STATS_COLLECTION, next_month
+
+# Set up logging
+logger = logging.getLogger(__name__)
+router = APIRouter(
+    prefix="/official",
+    tags=["official"],
+    dependencies=[Depends(check_official_role)],
+    route_class=DeadlineRoute,
+)
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def parse_month(value: str) -> datetime:
+    """Parses a `YYYY-MM` query value into the first instant of that month."""
+    return datetime.strptime(value, "%Y-%m")
+
+
+@router.get("/stats/requests", response_model=RequestStatsReport)
+async def get_request_stats(
+        start: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="First month, YYYY-MM"),
+        end: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="Last month (inclusive), YYYY-MM"),
+        service_area: Optional[str] = Query(None, max_length=50),
+        db=Depends(get_read_db),
+):
+    """
+    Platform-wide request counts by month, service area and status.
+    Served from the `request_stats` rollup, never from `requests` directly.
+    """
+    try:
+        query = {}
+        month_range = {}
+        if start:
+            month_range["$gte"] = parse_month(start)
+        if end:
+            month_range["$lt"] = next_month(parse_month(end))
+        if month_range:
+            query["month"] = month_range
+        if service_area is not None:
+            query["service_area"] = service_area.strip().lower() or None
+
+        logger.debug(f"Stats query: {query}")
+        buckets = await db[STATS_COLLECTION].find(query, {"_id": 0, "refreshed_at": 0}) \
+            .sort([("month", 1), ("service_area", 1)]) \
+            .to_list(length=None)
+
+        totals = {"total": 0, "by_status": {}}
+        for bucket in buckets:
+            totals["total"] += bucket.get("total", 0)
+            for status_name, count in bucket.get("by_status", {}).items():
+                totals["by_status"][status_name] = totals["by_status"].get(status_name, 0) + count
+
+        state = await db[STATE_COLLECTION].find_one({"_id": STATE_ID}, {"watermark": 1}) or {}
+
+        return {
+            "buckets": buckets,
+            "totals": totals,
+            "refreshed_through": state.get("watermark"),
+        }
+
+    except HTTPException:
+        raise
+    except PyMongoError as e:
+        logger.error(f"Database error: {e}")
+        raise database_error(e)
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        logger.exception("Full traceback:")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
@@ -1,35 +1,59 @@
 # backend/app/api/utils.py
 from bson import ObjectId
-from typing import Any
+from fastapi import HTTPException, status
+from typing import Annotated, Any
+from pydantic_core import core_schema
+from pymongo.errors import PyMongoError
 
 
-class PyObjectId(ObjectId):
-    @classmethod
-    def __get_validators__(cls):
-        # For Pydantic v1 compatibility
-        yield cls.validate
+def _validate_object_id(v: Any) -> ObjectId:
+    if isinstance(v, ObjectId):
+        return v
+    if isinstance(v, str) and ObjectId.is_valid(v):
+        return ObjectId(v)
+    raise ValueError("Invalid ObjectId")
 
-    @classmethod
-    def validate(cls, v: Any, _: Any = None) -> ObjectId:
-        if isinstance(v, ObjectId):
-            return v
-        if isinstance(v, str) and ObjectId.is_valid(v):
-            return ObjectId(v)
-        raise ValueError("Invalid ObjectId")
+
+class _ObjectIdAnnotation:
+    """
+    Native pydantic-core schema for bson.ObjectId.
+
+    Accepts an ObjectId or its 24-character hex string and always serializes
+    back to the hex string, so no v1 compatibility shims are involved.
+    """
 
     @classmethod
-    def __get_pydantic_json_schema__(cls, field_schema):
-        # For Pydantic v1 compatibility
-        field_schema.update(type="string")
-        return field_schema
+    def __get_pydantic_core_schema__(cls, _source_type: Any, _handler: Any) -> core_schema.CoreSchema:
+        from_str = core_schema.no_info_after_validator_function(
+            _validate_object_id,
+            core_schema.str_schema(),
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_str,
+            python_schema=core_schema.union_schema([
+                core_schema.is_instance_schema(ObjectId),
+                from_str,
+            ]),
+            serialization=core_schema.plain_serializer_function_ser_schema(str),
+        )
 
     @classmethod
-    def __modify_schema__(cls, field_schema):
-        # Alternative method for schema modification
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(cls, _core_schema: core_schema.CoreSchema, handler: Any) -> dict:
+        return handler(core_schema.str_schema())
+
+
+# Use as a field type: `id: PyObjectId`
+PyObjectId = Annotated[ObjectId, _ObjectIdAnnotation]
 
-    def __str__(self):
-        return str(super())
 
-    def __repr__(self):
-        return f"PyObjectId('{str(self)}')"
\ No newline at end of file
+def database_error(e: PyMongoError) -> HTTPException:
+    """HTTP error for a failed database call: 504 when it ran out of time, else 500."""
+    if e.timeout:
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Database error: {str(e)}"
+    )
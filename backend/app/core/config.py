@@ -1,14 +1,58 @@
 from pydantic_settings import BaseSettings
+from typing import Dict
 
 class Settings(BaseSettings):
     # MongoDB
     MONGO_CONNECTION_STRING: str
     DB_NAME: str = "property_maintenance_db"
+    # Send list/search/export reads to secondaries (secondaryPreferred)
+    READ_FROM_SECONDARIES: bool = True
+    # MongoDB requires at least 90 seconds
+    READ_MAX_STALENESS_SECONDS: int = 90
 
     # Auth0
     AUTH0_DOMAIN: str
     AUTH0_API_AUDIENCE: str
     AUTH0_ALGORITHMS: str
+    # Upper bound for fetching Auth0 signing keys; the request budget may cut it shorter
+    JWKS_FETCH_TIMEOUT_SECONDS: float = 5.0
+
+    # Request deadlines: route-prefix defaults, overridable per request
+    # with the X-Request-Timeout-Ms header up to the maximum
+    REQUEST_TIMEOUT_SECONDS: float = 10.0
+    REQUEST_MAX_TIMEOUT_SECONDS: float = 30.0
+    ROUTE_TIMEOUT_SECONDS: Dict[str, float] = {"/contractor": 5.0, "/official": 15.0}
+
+    # Contractor open-request feed
+    CONTRACTOR_FEED_DEFAULT_LIMIT: int = 20
+    CONTRACTOR_FEED_MAX_LIMIT: int = 100
+    CONTRACTOR_FEED_CACHE_TTL_SECONDS: float = 5.0
+    CONTRACTOR_FEED_CACHE_MAX_ENTRIES: int = 1024
+
+    # City-official analytics rollups (0 disables the in-app scheduler)
+    ROLLUP_REFRESH_INTERVAL_SECONDS: float = 300.0
+    # Re-scan this far behind the watermark to catch writes that committed late
+    ROLLUP_WATERMARK_OVERLAP_SECONDS: float = 60.0
+
+    # Background jobs (JOB_WORKERS_IN_APP = 0 leaves jobs to `python -m app.services.jobs`)
+    JOB_WORKERS_IN_APP: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_LOCK_SECONDS: float = 60.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_BASE_SECONDS: float = 2.0
+    JOB_BACKOFF_MAX_SECONDS: float = 300.0
+    JOB_RETENTION_SECONDS: int = 7 * 24 * 3600
+    JOB_OUTBOX_BATCH_SIZE: int = 500
+
+    # Coalesce concurrent request inserts into one insert_many
+    INSERT_BATCHING_ENABLED: bool = False
+    INSERT_BATCH_WINDOW_MS: float = 5.0
+    INSERT_BATCH_MAX_DOCS: int = 100
+
+    # Move completed/canceled requests to requests_archive (0 disables the in-app scheduler)
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_INTERVAL_SECONDS: float = 3600.0
 
     class Config:
         env_file = ".env"
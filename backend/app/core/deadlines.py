@@ -0,0 +1,173 @@
+# backend/app/core/deadlines.py
+"""
+End-to-end request deadlines.
+
+`DeadlineMiddleware` gives every HTTP request a time budget, taken from the
+X-Request-Timeout-Ms header or the route default and capped at
+REQUEST_MAX_TIMEOUT_SECONDS. Routes built with `DeadlineRoute` apply the
+budget to MongoDB through `pymongo.timeout` (so each operation carries the
+remaining time as maxTimeMS); other I/O, such as the JWKS fetch, reads it
+through `remaining_seconds()`. A request that runs out of budget gets a
+504, and one whose client disconnects is cancelled. The budget ends with
+the response; BackgroundTasks are not bound by it.
+"""
+import asyncio
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+import pymongo
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+# time.monotonic() value at which the current request's budget runs out
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def remaining_seconds() -> Optional[float]:
+    """Budget left for the current request, or None outside a request."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def end_deadline():
+    """
+    Lifts the budget for the rest of the current context. Called once the
+    response is sent, so BackgroundTasks (which Starlette runs in the same
+    task afterwards) do not inherit whatever time the handler left over.
+    """
+    _deadline.set(None)
+
+
+def deadline_exceeded() -> bool:
+    remaining = remaining_seconds()
+    return remaining is not None and remaining <= 0
+
+
+def route_timeout(path: str) -> float:
+    """Default budget for `path`: the longest matching ROUTE_TIMEOUT_SECONDS prefix."""
+    matches = [prefix for prefix in settings.ROUTE_TIMEOUT_SECONDS if path.startswith(prefix)]
+    if matches:
+        return settings.ROUTE_TIMEOUT_SECONDS[max(matches, key=len)]
+    return settings.REQUEST_TIMEOUT_SECONDS
+
+
+def request_timeout(scope) -> float:
+    timeout = route_timeout(scope["path"])
+    for name, value in scope.get("headers", []):
+        if name.decode("latin-1").lower() == DEADLINE_HEADER.lower():
+            try:
+                timeout = int(value) / 1000
+            except ValueError:
+                logger.error(f"Ignoring invalid {DEADLINE_HEADER} header: {value!r}")
+            break
+    # pymongo treats a zero timeout as "no timeout", so never go that low
+    return min(max(timeout, 0.001), settings.REQUEST_MAX_TIMEOUT_SECONDS)
+
+
+class DeadlineMiddleware:
+    """ASGI middleware enforcing the per-request budget."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = request_timeout(scope)
+        response_started = False
+        response_complete = False
+        messages: asyncio.Queue = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def read_client():
+            # Forward request messages to the app while watching for a disconnect
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+
+        async def tracked_send(message):
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+            if response_complete:
+                end_deadline()
+
+        async def run_app():
+            _deadline.set(time.monotonic() + timeout)
+            await self.app(scope, messages.get, tracked_send)
+
+        app_task = asyncio.create_task(run_app())
+        reader_task = asyncio.create_task(read_client())
+        disconnect_task = asyncio.create_task(disconnected.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {app_task, disconnect_task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if app_task in done or response_complete:
+                # Finished, or only background tasks are left after the response
+                await app_task
+                return
+
+            app_task.cancel()
+            await asyncio.gather(app_task, return_exceptions=True)
+            if disconnect_task in done:
+                logger.warning(f"Client disconnected, cancelled {scope['method']} {scope['path']}")
+                return
+
+            logger.error(f"Deadline of {timeout}s exceeded for {scope['method']} {scope['path']}")
+            if not response_started:
+                await send_deadline_exceeded(send)
+        finally:
+            if not app_task.done() and not response_complete:
+                app_task.cancel()
+            reader_task.cancel()
+            disconnect_task.cancel()
+
+
+class DeadlineRoute(APIRoute):
+    """
+    Runs the route handler (dependencies and endpoint) under
+    `pymongo.timeout` with the request's remaining budget. Sending the
+    response and BackgroundTasks happen after the handler returns, outside it.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def handler_with_deadline(request):
+            remaining = remaining_seconds()
+            if remaining is None:
+                return await handler(request)
+            # pymongo treats a zero timeout as "no timeout"
+            with pymongo.timeout(max(remaining, 0.001)):
+                return await handler(request)
+
+        return handler_with_deadline
+
+
+async def send_deadline_exceeded(send):
+    body = json.dumps({"detail": "Request deadline exceeded"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 504,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
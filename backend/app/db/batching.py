@@ -0,0 +1,182 @@
+# backend/app/db/batching.py
+"""
+Optional micro-batching for inserts.
+
+With INSERT_BATCHING_ENABLED, concurrent `insert_document` calls on the same
+collection are collected for up to INSERT_BATCH_WINDOW_MS (or until
+INSERT_BATCH_MAX_DOCS are waiting) and written with one unordered
+`insert_many`. Ids are assigned client-side, so every caller still gets its
+own id, or its own error if that document was rejected. A flush runs under
+the latest deadline among its callers.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pymongo
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+
+from app.core.config import settings
+from app.core.deadlines import remaining_seconds
+
+logger = logging.getLogger(__name__)
+
+
+def _create_detached_task(coro) -> asyncio.Task:
+    # A batch serves many requests, so it must not inherit the deadline
+    # (pymongo.timeout) of whichever request happened to start it; _flush
+    # applies one covering all of them
+    return contextvars.Context().run(asyncio.create_task, coro)
+
+
+class InsertBatcher:
+    """Coalesces inserts into one collection."""
+
+    def __init__(self, collection, window_ms: float, max_docs: int):
+        self.collection = collection
+        self.window_ms = window_ms
+        self.max_docs = max_docs
+        # (document, caller's future, caller's deadline as a time.monotonic() value)
+        self._pending: List[Tuple[Dict, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+        self.batches = 0
+        self.documents = 0
+        self.errors = 0
+        self.largest_batch = 0
+        self.flush_seconds_total = 0.0
+
+    async def insert(self, doc: Dict, session=None) -> ObjectId:
+        doc.setdefault("_id", ObjectId())
+        future = asyncio.get_running_loop().create_future()
+        remaining = remaining_seconds()
+        if remaining is None:
+            remaining = settings.REQUEST_MAX_TIMEOUT_SECONDS
+        self._pending.append((doc, future, time.monotonic() + remaining))
+
+        if len(self._pending) >= self.max_docs:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = _create_detached_task(self._flush_after_window())
+        inserted_id, operation_time, cluster_time = await future
+
+        # Let the caller's causally consistent session observe the batch write
+        if session is not None:
+            if cluster_time is not None:
+                session.advance_cluster_time(cluster_time)
+            if operation_time is not None:
+                session.advance_operation_time(operation_time)
+        return inserted_id
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.window_ms / 1000)
+        self._timer = None
+        self._start_flush()
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = _create_detached_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[Dict, asyncio.Future, float]]):
+        started = time.monotonic()
+        failed: Dict[int, Exception] = {}
+        operation_time = cluster_time = None
+        # Long enough for the most patient caller; the others stop waiting on their own
+        timeout = max(max(deadline for _, _, deadline in batch) - started, 0.001)
+        try:
+            client = self.collection.database.client
+            with pymongo.timeout(timeout):
+                async with await client.start_session(causal_consistency=True) as session:
+                    try:
+                        await self.collection.insert_many(
+                            [doc for doc, _, _ in batch], ordered=False, session=session
+                        )
+                    finally:
+                        operation_time, cluster_time = session.operation_time, session.cluster_time
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                error_class = DuplicateKeyError if error.get("code") == 11000 else WriteError
+                failed[error["index"]] = error_class(error.get("errmsg"), error.get("code"), error)
+            if e.details.get("writeConcernErrors"):
+                # The rest were written but their durability is unconfirmed
+                for index in range(len(batch)):
+                    failed.setdefault(index, e)
+        except Exception as e:
+            failed = {i: e for i in range(len(batch))}
+
+        self.batches += 1
+        self.documents += len(batch)
+        self.errors += len(failed)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.flush_seconds_total += time.monotonic() - started
+        logger.debug(f"Flushed {len(batch)} inserts into {self.collection.name} ({len(failed)} failed)")
+
+        for index, (doc, future, _) in enumerate(batch):
+            if future.done():
+                continue
+            if index in failed:
+                future.set_exception(failed[index])
+            else:
+                future.set_result((doc["_id"], operation_time, cluster_time))
+
+    async def close(self):
+        """Flushes anything still waiting."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def metrics(self) -> Dict:
+        return {
+            "window_ms": self.window_ms,
+            "max_docs": self.max_docs,
+            "batches": self.batches,
+            "documents": self.documents,
+            "errors": self.errors,
+            "average_batch_size": round(self.documents / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "average_flush_ms": round(self.flush_seconds_total / self.batches * 1000, 2) if self.batches else 0.0,
+            "pending": len(self._pending),
+        }
+
+
+# One batcher per collection, created on first use
+_batchers: Dict[str, InsertBatcher] = {}
+
+
+async def insert_document(collection, doc: Dict, session=None) -> ObjectId:
+    """
+    Inserts `doc` and returns its id, through the collection's batcher when
+    batching is enabled. `doc` gains its `_id` either way, and `session`
+    (if given) is advanced past the write.
+    """
+    if not settings.INSERT_BATCHING_ENABLED:
+        result = await collection.insert_one(doc, session=session)
+        return result.inserted_id
+
+    batcher = _batchers.get(collection.full_name)
+    if batcher is None:
+        batcher = InsertBatcher(collection, settings.INSERT_BATCH_WINDOW_MS, settings.INSERT_BATCH_MAX_DOCS)
+        _batchers[collection.full_name] = batcher
+    return await batcher.insert(doc, session=session)
+
+
+async def close_insert_batchers():
+    for batcher in _batchers.values():
+        await batcher.close()
+    _batchers.clear()
+
+
+def get_insert_metrics() -> Dict:
+    return {
+        "enabled": settings.INSERT_BATCHING_ENABLED,
+        "collections": {name: batcher.metrics() for name, batcher in _batchers.items()},
+    }
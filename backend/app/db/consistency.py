@@ -0,0 +1,78 @@
+# backend/app/db/consistency.py
+"""
+Read-your-writes across primary and secondary reads.
+
+After a write, the session's operation and cluster times are returned to
+the client as an opaque token (X-Consistency-Token) and also remembered
+per user. A later request that presents the token, or comes from the same
+user, starts a causally consistent session advanced to those times, so a
+secondary only answers once it has replicated the write.
+"""
+import base64
+import binascii
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import bson
+from bson.errors import BSONError
+from fastapi import Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONSISTENCY_HEADER = "X-Consistency-Token"
+
+# Secondaries may lag at most READ_MAX_STALENESS_SECONDS, so older tokens add nothing
+_last_write_tokens = TTLCache(ttl_seconds=settings.READ_MAX_STALENESS_SECONDS, max_entries=10000)
+
+
+def encode_consistency_token(session) -> Optional[str]:
+    if session is None or session.operation_time is None:
+        return None
+    token = {"operationTime": session.operation_time}
+    if session.cluster_time is not None:
+        token["clusterTime"] = session.cluster_time
+    return base64.urlsafe_b64encode(bson.encode(token)).decode()
+
+
+def apply_consistency_token(session, token: str) -> bool:
+    """Advances `session` to the write described by `token`. Invalid tokens are ignored."""
+    try:
+        decoded = bson.decode(base64.urlsafe_b64decode(token.encode()))
+        if "clusterTime" in decoded:
+            session.advance_cluster_time(decoded["clusterTime"])
+        session.advance_operation_time(decoded["operationTime"])
+        return True
+    except (BSONError, binascii.Error, KeyError, TypeError, ValueError) as e:
+        logger.error(f"Ignoring invalid consistency token: {e}")
+        return False
+
+
+@dataclass
+class DbHandles:
+    """
+    Database handles for one request. `read` may be served by a secondary,
+    `write` always targets the primary, and `session` ties them together.
+    """
+    read: object
+    write: object
+    session: object = None
+    response: Optional[Response] = None
+    user_id: Optional[str] = None
+
+    def record_write(self):
+        """Call after a write so the caller's next reads observe it."""
+        token = encode_consistency_token(self.session)
+        if token is None:
+            return
+        if self.response is not None:
+            self.response.headers[CONSISTENCY_HEADER] = token
+        if self.user_id:
+            _last_write_tokens.set(self.user_id, token)
+
+
+def last_write_token(user_id: Optional[str]) -> Optional[str]:
+    return _last_write_tokens.get(user_id) if user_id else None
@@ -0,0 +1,91 @@
+# backend/app/db/indexes.py
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.core.config import settings
+from app.models.maintenance import ACTIVE_STATUSES, MaintenanceStatus
+
+# Only open requests are indexed for the contractor feed, so these indexes
+# stay small however many completed requests accumulate.
+OPEN_ONLY = {"status": MaintenanceStatus.OPEN.value}
+
+# Feed sort order; `_id` breaks ties between equal timestamps for keyset paging
+FEED_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+REQUEST_INDEXES = [
+    IndexModel(
+        [("homeowner_id", ASCENDING), ("created_at", DESCENDING)],
+        name="homeowner_recent",
+    ),
+    # Dashboard view of work still in progress (partial `$in` needs MongoDB 6.0+)
+    IndexModel(
+        [("homeowner_id", ASCENDING), ("created_at", DESCENDING)],
+        name="homeowner_active",
+        partialFilterExpression={"status": {"$in": ACTIVE_STATUSES}},
+    ),
+    # Used by the analytics rollup to find changed requests and rebuild months
+    IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    IndexModel([("created_at", ASCENDING)], name="created_at"),
+    # Outbox sweep: requests whose notify_contractors job is not enqueued yet
+    IndexModel(
+        [("created_at", ASCENDING)],
+        name="notify_pending",
+        partialFilterExpression={"notify_pending": True},
+    ),
+    IndexModel(
+        FEED_SORT,
+        name="open_feed",
+        partialFilterExpression=OPEN_ONLY,
+    ),
+    IndexModel(
+        [("category", ASCENDING), *FEED_SORT],
+        name="open_feed_by_category",
+        partialFilterExpression=OPEN_ONLY,
+    ),
+    IndexModel(
+        [("service_area", ASCENDING), *FEED_SORT],
+        name="open_feed_by_area",
+        partialFilterExpression=OPEN_ONLY,
+    ),
+    IndexModel(
+        [("service_area", ASCENDING), ("category", ASCENDING), *FEED_SORT],
+        name="open_feed_by_area_category",
+        partialFilterExpression=OPEN_ONLY,
+    ),
+]
+
+# Cold tier: homeowner history lookups and analytics month rebuilds
+REQUEST_ARCHIVE_INDEXES = [
+    IndexModel(
+        [("homeowner_id", ASCENDING), ("created_at", DESCENDING)],
+        name="homeowner_recent",
+    ),
+    IndexModel([("created_at", ASCENDING)], name="created_at"),
+]
+
+# Analytics reads select a month range, optionally for one service area
+REQUEST_STATS_INDEXES = [
+    IndexModel([("month", ASCENDING), ("service_area", ASCENDING)], name="month_area"),
+]
+
+JOB_INDEXES = [
+    # Workers claim the oldest due job in a given state
+    IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="status_run_at"),
+    # Finished jobs are removed automatically after the retention period
+    IndexModel(
+        [("finished_at", ASCENDING)],
+        name="finished_ttl",
+        expireAfterSeconds=settings.JOB_RETENTION_SECONDS,
+        partialFilterExpression={"status": "done"},
+    ),
+]
+
+
+async def ensure_indexes(db):
+    """
+    Creates the indexes the API relies on. Safe to call on every startup;
+    MongoDB skips indexes that already exist with the same definition.
+    """
+    await db["requests"].create_indexes(REQUEST_INDEXES)
+    await db["requests_archive"].create_indexes(REQUEST_ARCHIVE_INDEXES)
+    await db["request_stats"].create_indexes(REQUEST_STATS_INDEXES)
+    await db["jobs"].create_indexes(JOB_INDEXES)
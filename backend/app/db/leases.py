@@ -0,0 +1,75 @@
+# backend/app/db/leases.py
+import asyncio
+import logging
+import os
+import socket
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+LEASES_COLLECTION = "leases"
+
+
+async def acquire_lease(db, name: str, lease_seconds: float, holder: Optional[str] = None) -> bool:
+    """
+    Lets only one app worker run a scheduled task named `name` per interval.
+    Returns True when this worker holds the lease.
+    """
+    now = datetime.utcnow()
+    try:
+        await db[LEASES_COLLECTION].find_one_and_update(
+            {"_id": name, "$or": [{"lease_until": {"$exists": False}}, {"lease_until": {"$lt": now}}]},
+            {"$set": {"lease_until": now + timedelta(seconds=lease_seconds), "holder": holder}},
+            upsert=True,
+        )
+        return True
+    except DuplicateKeyError:
+        # The lease document exists and another worker's lease is still valid
+        return False
+
+
+async def _keep_renewed(db, name: str, holder: str, lease_seconds: float):
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        try:
+            result = await db[LEASES_COLLECTION].update_one(
+                {"_id": name, "holder": holder},
+                {"$set": {"lease_until": datetime.utcnow() + timedelta(seconds=lease_seconds)}},
+            )
+            if result.matched_count == 0:
+                logger.error(f"Lost lease {name}; another worker may now run concurrently")
+                return
+        except PyMongoError as e:
+            logger.error(f"Failed to renew lease {name}: {e}")
+
+
+@asynccontextmanager
+async def held_lease(db, name: str, lease_seconds: float):
+    """
+    Mutual exclusion for work of unknown length. Yields whether the lease was
+    acquired; while held it is renewed every `lease_seconds / 3`, and it is
+    released on exit.
+    """
+    holder = f"{socket.gethostname()}:{os.getpid()}:{ObjectId()}"
+    if not await acquire_lease(db, name, lease_seconds, holder=holder):
+        yield False
+        return
+
+    renewer = asyncio.create_task(_keep_renewed(db, name, holder, lease_seconds))
+    try:
+        yield True
+    finally:
+        renewer.cancel()
+        await asyncio.gather(renewer, return_exceptions=True)
+        try:
+            await db[LEASES_COLLECTION].update_one(
+                {"_id": name, "holder": holder},
+                {"$set": {"lease_until": datetime.utcnow()}},
+            )
+        except PyMongoError as e:
+            logger.error(f"Failed to release lease {name}; it expires on its own: {e}")
@@ -1,22 +1,40 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_preferences import Primary, SecondaryPreferred
 from app.core.config import settings
+from app.db.indexes import ensure_indexes
 
 # Global variables for the MongoDB client and database
 client = None
 db = None
+# Same database, routed for list/search/export reads
+read_db = None
+
+
+def read_preference():
+    if settings.READ_FROM_SECONDARIES:
+        return SecondaryPreferred(max_staleness=settings.READ_MAX_STALENESS_SECONDS)
+    return Primary()
 
 async def connect_to_mongo():
     """
     Connects to the MongoDB Atlas database.
     """
-    global client, db
+    global client, db, read_db
     print("Connecting to MongoDB...")
     try:
         client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
         db = client[settings.DB_NAME]
+        read_db = client.get_database(settings.DB_NAME, read_preference=read_preference())
         print("Successfully connected to MongoDB.")
     except Exception as e:
         print(f"Failed to connect to MongoDB: {e}")
+        return
+
+    try:
+        await ensure_indexes(db)
+        print("MongoDB indexes are up to date.")
+    except Exception as e:
+        print(f"Failed to create MongoDB indexes: {e}")
 
 async def close_mongo_connection():
     """
@@ -30,5 +48,16 @@ async def close_mongo_connection():
 def get_db():
     """
     FastAPI dependency to get the database instance.
+    Reads and writes through it go to the primary.
     """
     return db
+
+def get_read_db():
+    """
+    FastAPI dependency to get the database instance for list, search and
+    export reads, which may be served by a secondary.
+    """
+    return read_db
+
+def get_client():
+    return client
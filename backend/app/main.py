@@ -3,12 +3,19 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.deadlines import DeadlineMiddleware, DeadlineRoute
+
 # Import your database connection logic
-from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.db.batching import close_insert_batchers, get_insert_metrics
+from app.db.consistency import CONSISTENCY_HEADER
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_db
+from app.services.archival import start_archival_scheduler, stop_archival_scheduler
+from app.services.jobs import get_job_metrics, start_job_workers, stop_job_workers
+from app.services.rollups import start_rollup_scheduler, stop_rollup_scheduler
 
 # Import your security dependencies and routers
-from app.api.deps import check_homeowner_role
-from app.api.endpoints import homeowner
+from app.api.deps import check_homeowner_role, check_official_role
+from app.api.endpoints import contractor, homeowner, official
 
 # Initialize the FastAPI app
 app = FastAPI(
@@ -16,8 +23,13 @@ app = FastAPI(
     version="1.0.0",
     description="API for homeowners and contractors to manage maintenance requests."
 )
+# Apply the request budget to MongoDB in app-level routes too (routers set their own)
+app.router.route_class = DeadlineRoute
 
 # --- Middleware ---
+# Enforce a time budget on every request (504 when exhausted)
+app.add_middleware(DeadlineMiddleware)
+
 # Add CORS middleware to allow cross-origin requests from your frontend
 app.add_middleware(
     CORSMiddleware,
@@ -25,20 +37,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CONSISTENCY_HEADER],  # Lets the frontend read it and send it back
 )
 
 # --- Database Connection Events ---
 @app.on_event("startup")
 async def startup_event():
     await connect_to_mongo()
+    start_rollup_scheduler(get_db())
+    start_job_workers(get_db())
+    start_archival_scheduler(get_db())
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await stop_archival_scheduler()
+    await stop_job_workers()
+    await stop_rollup_scheduler()
+    await close_insert_batchers()
     await close_mongo_connection()
 
 # --- API Routers ---
 # Include the router from homeowner.py. All endpoints from that file will now be active.
 app.include_router(homeowner.router)
+app.include_router(contractor.router)
+app.include_router(official.router)
 
 
 # --- Test & Root Endpoints ---
@@ -50,4 +72,15 @@ async def read_root():
 @app.get("/test-auth", tags=["Test"], dependencies=[Depends(check_homeowner_role)])
 async def test_auth():
     """An endpoint to test if the homeowner role check is working."""
-    return {"message": "You are a homeowner and have successfully authenticated!"}
\ No newline at end of file
+    return {"message": "You are a homeowner and have successfully authenticated!"}
+
+# Operational metrics are for staff only
+@app.get("/metrics/jobs", tags=["Metrics"], dependencies=[Depends(check_official_role)])
+async def job_metrics(db=Depends(get_db)):
+    """Background job throughput and queue depth."""
+    return await get_job_metrics(db)
+
+@app.get("/metrics/inserts", tags=["Metrics"], dependencies=[Depends(check_official_role)])
+async def insert_metrics():
+    """Insert batching configuration and batch sizes."""
+    return get_insert_metrics()
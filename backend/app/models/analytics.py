@@ -0,0 +1,24 @@
+# backend/app/models/analytics.py
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+
+class RequestStatsBucket(BaseModel):
+    """Request counts for one month in one service area (None = unassigned)."""
+    month: datetime
+    service_area: Optional[str] = None
+    total: int = 0
+    by_status: Dict[str, int] = Field(default_factory=dict)
+
+
+class RequestStatsTotals(BaseModel):
+    total: int = 0
+    by_status: Dict[str, int] = Field(default_factory=dict)
+
+
+class RequestStatsReport(BaseModel):
+    buckets: List[RequestStatsBucket]
+    totals: RequestStatsTotals
+    # Data reflects requests updated up to this time
+    refreshed_through: Optional[datetime] = None
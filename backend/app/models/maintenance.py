@@ -1,70 +1,115 @@
 # backend/app/models/maintenance.py
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+from typing import Annotated, Optional, List
 from app.api.utils import PyObjectId
 
 
-class MaintenanceStatus:
+class MaintenanceStatus(str, Enum):
     OPEN = "open"
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     CANCELED = "canceled"
 
 
-class MaintenanceRequest(BaseModel):
-    title: str = Field(..., min_length=3, max_length=100)
-    description: str = Field(..., min_length=10, max_length=500)
-    homeowner_id: str
-    status: Optional[str] = Field(default=MaintenanceStatus.OPEN)
-    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+# Requests still being worked on, and those that are finished for good
+ACTIVE_STATUSES = [MaintenanceStatus.OPEN.value, MaintenanceStatus.IN_PROGRESS.value]
+TERMINAL_STATUSES = [MaintenanceStatus.COMPLETED.value, MaintenanceStatus.CANCELED.value]
+
+
+class MaintenanceCategory(str, Enum):
+    PLUMBING = "plumbing"
+    ELECTRICAL = "electrical"
+    HVAC = "hvac"
+    ROOFING = "roofing"
+    APPLIANCE = "appliance"
+    LANDSCAPING = "landscaping"
+    GENERAL = "general"
+
+
+# Field constraints shared by every input model. Whitespace is stripped
+# before the length checks run.
+Title = Annotated[str, StringConstraints(strip_whitespace=True, min_length=3, max_length=100)]
+Description = Annotated[str, StringConstraints(strip_whitespace=True, min_length=10, max_length=500)]
+HomeownerId = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+# Zip code or neighborhood name; lower-cased so feed filters match exactly
+ServiceArea = Annotated[str, StringConstraints(strip_whitespace=True, to_lower=True, min_length=1, max_length=50)]
+
+
+class MaintenanceRequestCreate(BaseModel):
+    """Body accepted by POST /homeowner/requests."""
+    model_config = ConfigDict(extra="ignore", use_enum_values=True)
+
+    title: Title
+    description: Description
+    homeowner_id: HomeownerId
+    category: Optional[MaintenanceCategory] = None
+    service_area: Optional[ServiceArea] = None
     image_url: Optional[str] = None
-    bids: List[dict] = Field(default=[])
 
-    @validator('status', pre=True, always=True)
-    def validate_status(cls, v):
-        # If status is None or empty, set to default
-        if not v:
-            return MaintenanceStatus.OPEN
 
-        valid_statuses = [
-            MaintenanceStatus.OPEN,
-            MaintenanceStatus.IN_PROGRESS,
-            MaintenanceStatus.COMPLETED,
-            MaintenanceStatus.CANCELED
-        ]
-        if v not in valid_statuses:
-            raise ValueError(f'status must be one of {valid_statuses}')
-        return v
+class MaintenanceRequest(MaintenanceRequestCreate):
+    """A maintenance request document as stored in the `requests` collection."""
+    model_config = ConfigDict(use_enum_values=True)
 
+    status: MaintenanceStatus = MaintenanceStatus.OPEN
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    bids: List[dict] = Field(default_factory=list)
 
-class MaintenanceRequestOut(MaintenanceRequest):
-    # Use our PyObjectId helper for the id field
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
 
-    class Config:
-        from_attributes = True
-        populate_by_name = True
-        json_encoders = {PyObjectId: str}
+class MaintenanceRequestOut(BaseModel):
+    """
+    Response shape for a stored request. Constraints are not re-applied here
+    so documents written under older rules still serialize.
+    """
+    model_config = ConfigDict(populate_by_name=True, use_enum_values=True)
+
+    id: PyObjectId = Field(alias="_id", serialization_alias="id")
+    title: str
+    description: str
+    homeowner_id: str
+    category: Optional[str] = None
+    service_area: Optional[str] = None
+    status: MaintenanceStatus = MaintenanceStatus.OPEN
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    image_url: Optional[str] = None
+    bids: List[dict] = Field(default_factory=list)
+    # Set once the request has moved to the archive
+    archived_at: Optional[datetime] = None
 
 
 class MaintenanceRequestUpdate(BaseModel):
-    title: Optional[str] = Field(None, min_length=3, max_length=100)
-    description: Optional[str] = Field(None, min_length=10, max_length=500)
-    status: Optional[str] = None
+    """Body accepted by PUT /homeowner/requests/{request_id}."""
+    model_config = ConfigDict(use_enum_values=True)
+
+    title: Optional[Title] = None
+    description: Optional[Description] = None
+    status: Optional[MaintenanceStatus] = None
+    category: Optional[MaintenanceCategory] = None
+    service_area: Optional[ServiceArea] = None
+    image_url: Optional[str] = None
+
+
+class OpenRequestOut(BaseModel):
+    """
+    A request as shown to contractors browsing the open feed. Homeowner
+    identity and existing bids are left out.
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PyObjectId = Field(alias="_id", serialization_alias="id")
+    title: str
+    description: str
+    category: Optional[str] = None
+    service_area: Optional[str] = None
+    created_at: datetime
     image_url: Optional[str] = None
 
-    @validator('status', pre=True)
-    def validate_status(cls, v):
-        if v is None:
-            return v
-
-        valid_statuses = [
-            MaintenanceStatus.OPEN,
-            MaintenanceStatus.IN_PROGRESS,
-            MaintenanceStatus.COMPLETED,
-            MaintenanceStatus.CANCELED
-        ]
-        if v not in valid_statuses:
-            raise ValueError(f'status must be one of {valid_statuses}')
-        return v
\ No newline at end of file
+
+class OpenRequestFeedPage(BaseModel):
+    items: List[OpenRequestOut]
+    # Opaque keyset cursor for the next page; None on the last page
+    next_cursor: Optional[str] = None
@@ -0,0 +1,139 @@
+# backend/app/services/archival.py
+"""
+Hot/cold tiering for maintenance requests.
+
+Completed and canceled requests that have not changed for ARCHIVE_AFTER_DAYS
+are moved from `requests` to `requests_archive` in batches, keeping the hot
+collection and its indexes down to active work. Each batch is copied and
+deleted in one transaction, so a request edited or deleted by its
+homeowner mid-move is never left behind in (or resurrected from) the
+archive.
+
+Runs on a schedule inside the app (ARCHIVE_INTERVAL_SECONDS) or on demand:
+    python -m app.services.archival [--older-than-days N]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from pymongo import ReplaceOne
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.leases import acquire_lease
+from app.db.mongodb import close_mongo_connection, connect_to_mongo, get_db
+from app.models.maintenance import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLLECTION = "requests_archive"
+LEASE_NAME = "archive_requests"
+
+# Background scheduler task started with the app
+_scheduler_task: Optional[asyncio.Task] = None
+
+
+async def archive_batch(db, cutoff: datetime, batch_size: int) -> int:
+    """Moves up to `batch_size` archivable requests. Returns how many moved."""
+    eligible = {"status": {"$in": TERMINAL_STATUSES}, "updated_at": {"$lt": cutoff}}
+    candidates = await db["requests"].find(eligible, {"_id": 1}) \
+        .sort("updated_at", 1).limit(batch_size).to_list(length=batch_size)
+    if not candidates:
+        return 0
+    batch_filter = {"_id": {"$in": [doc["_id"] for doc in candidates]}, **eligible}
+
+    async def move(session):
+        # Re-read inside the transaction: requests edited or deleted since the
+        # scan drop out, and concurrent changes abort and retry the move
+        docs = await db["requests"].find(batch_filter, session=session).to_list(length=batch_size)
+        if not docs:
+            return 0
+        archived_at = datetime.utcnow()
+        for doc in docs:
+            doc["archived_at"] = archived_at
+        await db[ARCHIVE_COLLECTION].bulk_write(
+            [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs],
+            ordered=False, session=session,
+        )
+        result = await db["requests"].delete_many(
+            {"_id": {"$in": [doc["_id"] for doc in docs]}}, session=session
+        )
+        return result.deleted_count
+
+    async with await db.client.start_session() as session:
+        return await session.with_transaction(move)
+
+
+async def archive_terminal_requests(db, older_than_days: Optional[int] = None,
+                                    batch_size: Optional[int] = None) -> Dict:
+    """Archives every eligible request, one batch at a time."""
+    older_than_days = older_than_days if older_than_days is not None else settings.ARCHIVE_AFTER_DAYS
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+
+    started = datetime.utcnow()
+    moved = batches = 0
+    while True:
+        count = await archive_batch(db, cutoff, batch_size)
+        if count == 0:
+            break
+        moved += count
+        batches += 1
+
+    result = {
+        "archived": moved,
+        "batches": batches,
+        "cutoff": cutoff,
+        "seconds": (datetime.utcnow() - started).total_seconds(),
+    }
+    logger.info(f"Request archival finished: {result}")
+    return result
+
+
+async def _run_scheduler(db, interval: float):
+    while True:
+        try:
+            if await acquire_lease(db, LEASE_NAME, interval):
+                await archive_terminal_requests(db)
+        except PyMongoError as e:
+            logger.error(f"Request archival failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def start_archival_scheduler(db):
+    """Starts periodic archival inside the app, if an interval is configured."""
+    global _scheduler_task
+    interval = settings.ARCHIVE_INTERVAL_SECONDS
+    if db is None or interval <= 0 or _scheduler_task is not None:
+        return
+    _scheduler_task = asyncio.create_task(_run_scheduler(db, interval))
+
+
+async def stop_archival_scheduler():
+    global _scheduler_task
+    if _scheduler_task is not None:
+        _scheduler_task.cancel()
+        try:
+            await _scheduler_task
+        except asyncio.CancelledError:
+            pass
+        _scheduler_task = None
+
+
+async def _main(older_than_days: Optional[int], batch_size: Optional[int]):
+    await connect_to_mongo()
+    try:
+        result = await archive_terminal_requests(get_db(), older_than_days, batch_size)
+        print(result)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move old completed/canceled requests to requests_archive.")
+    parser.add_argument("--older-than-days", type=int, default=None, help="defaults to ARCHIVE_AFTER_DAYS")
+    parser.add_argument("--batch-size", type=int, default=None, help="defaults to ARCHIVE_BATCH_SIZE")
+    args = parser.parse_args()
+    asyncio.run(_main(args.older_than_days, args.batch_size))
@@ -0,0 +1,442 @@
+# backend/app/services/bulk_import.py
+"""
+Bulk loading for the `requests` collection.
+
+`import` streams NDJSON or CSV from disk, validates every record with the
+`MaintenanceRequest` model and writes unordered `insert_many` batches
+concurrently. Progress is checkpointed to a JSON file, so a failed run
+resumes where it stopped. Document ids are derived from the source key (the
+file's resolved path and content hash, or `--source-id`) and line number,
+which makes re-inserting an already imported batch a no-op (duplicate key)
+instead of a duplicate request. Duplicate keys are checked against the
+stored document; one that differs is reported as a conflict. The months of
+written requests are queued for the `request_stats` rollup, whose
+incremental refresh would otherwise miss their old `updated_at` values.
+
+`synthetic` generates homeowners and requests with a skewed, realistic
+distribution for load testing, either straight into the database or to an
+NDJSON file for `import`.
+
+Run from the backend directory:
+    python -m app.services.bulk_import import requests.ndjson --batch-size 1000 --concurrency 8
+    python -m app.services.bulk_import synthetic --requests 1000000 --homeowners 50000
+    python -m app.services.bulk_import synthetic --requests 100000 --output seed.ndjson
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from app.db.mongodb import close_mongo_connection, connect_to_mongo, get_db
+from app.models.maintenance import MaintenanceCategory, MaintenanceRequest, MaintenanceStatus
+from app.services.rollups import mark_months_changed
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_RETRIES = 3
+
+
+# Fields compared when an insert hits an existing id
+IDENTITY_FIELDS = ("homeowner_id", "title", "description")
+
+
+def source_key_for(path: str) -> str:
+    """Identifies a file by location and content, so a different or edited file gets new ids."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return f"{os.path.realpath(path)}:{digest.hexdigest()}"
+
+
+def import_id(source_key: str, line_no: int) -> ObjectId:
+    """Stable id for record `line_no` of `source_key`, so retries cannot duplicate it."""
+    return ObjectId(hashlib.blake2b(f"{source_key}:{line_no}".encode(), digest_size=12).digest())
+
+
+# --- Readers -----------------------------------------------------------------
+
+def read_ndjson(path: str, skip_through: int) -> Iterator[Tuple[int, object]]:
+    with open(path, "rb") as f:
+        for line_no, line in enumerate(f, start=1):
+            if line_no <= skip_through or not line.strip():
+                continue
+            yield line_no, line
+
+
+def read_csv(path: str, skip_through: int) -> Iterator[Tuple[int, object]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        # Line 1 is the header, so data rows start at 2
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            if line_no <= skip_through:
+                continue
+            # Empty cells mean "not set" rather than an empty string
+            yield line_no, {key: value for key, value in row.items() if key and value != ""}
+
+
+def to_document(raw) -> Dict:
+    """Validates one raw record (NDJSON bytes or a CSV row) into a stored document."""
+    if isinstance(raw, (bytes, str)):
+        request = MaintenanceRequest.model_validate_json(raw)
+    else:
+        request = MaintenanceRequest.model_validate(raw)
+    doc = request.model_dump()
+    if "updated_at" not in request.model_fields_set:
+        # The model default is "now", which would make migrated history look
+        # freshly edited and keep it out of archival
+        doc["updated_at"] = doc["created_at"]
+    return doc
+
+
+# --- Synthetic data ----------------------------------------------------------
+
+TITLES = {
+    MaintenanceCategory.PLUMBING: ["Leaking faucet", "Clogged drain", "Running toilet", "Low water pressure"],
+    MaintenanceCategory.ELECTRICAL: ["Outlet not working", "Flickering lights", "Breaker keeps tripping"],
+    MaintenanceCategory.HVAC: ["AC not cooling", "Furnace won't start", "Noisy air handler"],
+    MaintenanceCategory.ROOFING: ["Roof leak after storm", "Missing shingles", "Damaged gutter"],
+    MaintenanceCategory.APPLIANCE: ["Dishwasher not draining", "Fridge too warm", "Dryer not heating"],
+    MaintenanceCategory.LANDSCAPING: ["Fallen tree branch", "Overgrown hedges", "Broken sprinkler head"],
+    MaintenanceCategory.GENERAL: ["Door sticks when closing", "Cracked window", "Drywall hole"],
+}
+# Plumbing and HVAC dominate real maintenance queues
+CATEGORY_WEIGHTS = {
+    MaintenanceCategory.PLUMBING: 30, MaintenanceCategory.ELECTRICAL: 15, MaintenanceCategory.HVAC: 20,
+    MaintenanceCategory.ROOFING: 8, MaintenanceCategory.APPLIANCE: 12, MaintenanceCategory.LANDSCAPING: 5,
+    MaintenanceCategory.GENERAL: 10,
+}
+# Most history is finished work; a minority is still active
+STATUS_WEIGHTS = {
+    MaintenanceStatus.OPEN: 15, MaintenanceStatus.IN_PROGRESS: 10,
+    MaintenanceStatus.COMPLETED: 65, MaintenanceStatus.CANCELED: 10,
+}
+
+
+def synthetic_requests(count: int, homeowners: int, areas: int, days: int, seed: int,
+                       skip_through: int = 0) -> Iterator[Tuple[int, object]]:
+    """
+    Yields `count` synthetic request records. Requests per homeowner and per
+    service area follow a Zipf-like skew, and creation times lean towards
+    the recent end of the `days` window.
+    """
+    rng = random.Random(seed)
+    # Cumulative weights, so each draw is a bisect rather than a re-sum
+    homeowner_ids = range(homeowners)
+    homeowner_weights = list(accumulate(1 / (rank ** 0.7) for rank in range(1, homeowners + 1)))
+    area_names = [f"{10001 + i:05d}" for i in range(areas)]
+    area_weights = list(accumulate(1 / rank for rank in range(1, areas + 1)))
+    categories, category_weights = zip(*CATEGORY_WEIGHTS.items())
+    category_weights = list(accumulate(category_weights))
+    statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+    status_weights = list(accumulate(status_weights))
+    now = datetime.utcnow()
+
+    for index in range(1, count + 1):
+        # Draw every value even for skipped records so a resumed run generates the same data
+        homeowner = rng.choices(homeowner_ids, cum_weights=homeowner_weights)[0]
+        area = rng.choices(area_names, cum_weights=area_weights)[0]
+        category = rng.choices(categories, cum_weights=category_weights)[0]
+        request_status = rng.choices(statuses, cum_weights=status_weights)[0]
+        age_days = days * (rng.random() ** 2)
+        title = rng.choice(TITLES[category])
+        if index <= skip_through:
+            continue
+
+        created_at = now - timedelta(days=age_days)
+        if request_status == MaintenanceStatus.OPEN:
+            updated_at = created_at
+        else:
+            updated_at = min(created_at + timedelta(days=rng.expovariate(1 / 7)), now)
+        yield index, {
+            "title": title,
+            "description": f"{title} reported at the property in area {area}. Please advise on a repair visit.",
+            "homeowner_id": f"auth0|synthetic-{homeowner:07d}",
+            "category": category.value,
+            "service_area": area,
+            "status": request_status.value,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+
+# --- Loader ------------------------------------------------------------------
+
+class Checkpoint:
+    """
+    Highest line number below which every batch has been written. Batches
+    finish out of order, so the mark only advances over a contiguous prefix.
+    """
+
+    def __init__(self, path: Optional[str], source: str, line: int = 0):
+        self.path = path
+        self.source = source
+        self.line = line
+        self._in_flight: deque = deque()
+        self._finished: set = set()
+        self._saved_at = 0.0
+
+    @classmethod
+    def load(cls, path: Optional[str], source: str) -> "Checkpoint":
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("source") == source:
+                return cls(path, source, data.get("line", 0))
+            logger.warning(f"Ignoring checkpoint {path}: it belongs to {data.get('source')}")
+        return cls(path, source)
+
+    def started(self, last_line: int):
+        self._in_flight.append(last_line)
+
+    def finished(self, last_line: int, stats: "ImportStats"):
+        self._finished.add(last_line)
+        while self._in_flight and self._in_flight[0] in self._finished:
+            self._finished.remove(self._in_flight[0])
+            self.line = self._in_flight.popleft()
+        if time.monotonic() - self._saved_at >= 1:
+            self.save(stats)
+
+    def save(self, stats: "ImportStats"):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"source": self.source, "line": self.line, **stats.as_dict()}, f, default=str)
+        os.replace(tmp_path, self.path)
+        self._saved_at = time.monotonic()
+
+
+class ImportStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.read = 0
+        self.invalid = 0
+        self.inserted = 0
+        self.already_imported = 0
+        self.conflicts = 0
+        self.failed = 0
+
+    def rows_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return (self.inserted + self.already_imported) / elapsed if elapsed else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "read": self.read,
+            "invalid": self.invalid,
+            "inserted": self.inserted,
+            "already_imported": self.already_imported,
+            "conflicts": self.conflicts,
+            "failed": self.failed,
+            "rows_per_second": round(self.rows_per_second(), 1),
+            "seconds": round(time.monotonic() - self.started, 1),
+        }
+
+
+async def check_duplicates(collection, docs: List[Dict], stats: ImportStats):
+    """
+    Sorts documents whose id already exists into already imported (same
+    record, e.g. a resumed batch) and conflicts (different data under the id).
+    """
+    projection = {field: 1 for field in IDENTITY_FIELDS}
+    existing = {
+        doc["_id"]: doc
+        async for doc in collection.find({"_id": {"$in": [doc["_id"] for doc in docs]}}, projection)
+    }
+    conflicts = [
+        doc["_id"] for doc in docs
+        if any(existing.get(doc["_id"], {}).get(field) != doc.get(field) for field in IDENTITY_FIELDS)
+    ]
+    stats.already_imported += len(docs) - len(conflicts)
+    stats.conflicts += len(conflicts)
+    if conflicts:
+        logger.error(f"{len(conflicts)} ids already hold different requests (first: {conflicts[0]}); not imported")
+
+
+async def write_batch(collection, docs: List[Dict], stats: ImportStats):
+    for attempt in range(1, MAX_BATCH_RETRIES + 1):
+        try:
+            result = await collection.insert_many(docs, ordered=False)
+            stats.inserted += len(result.inserted_ids)
+            return
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            duplicates = [docs[error["index"]] for error in errors if error.get("code") == 11000]
+            stats.inserted += e.details.get("nInserted", 0)
+            stats.failed += len(errors) - len(duplicates)
+            for error in errors[:3]:
+                if error.get("code") != 11000:
+                    logger.error(f"Rejected document: {error.get('errmsg')}")
+            if duplicates:
+                await check_duplicates(collection, duplicates, stats)
+            return
+        except PyMongoError as e:
+            if attempt == MAX_BATCH_RETRIES:
+                raise
+            logger.warning(f"Batch failed (attempt {attempt}), retrying: {e}")
+            await asyncio.sleep(2 ** attempt)
+
+
+async def load(collection, records: Iterator[Tuple[int, object]], source_key: str, checkpoint: Checkpoint,
+               batch_size: int, concurrency: int, report_every: float,
+               rejects_path: Optional[str] = None) -> ImportStats:
+    stats = ImportStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = set()
+    last_report = time.monotonic()
+    rejects = open(rejects_path, "a") if rejects_path else None
+
+    async def run_batch(docs: List[Dict], last_line: int):
+        try:
+            await write_batch(collection, docs, stats)
+            # Marked before the checkpoint moves, so a resumed run cannot skip it
+            await mark_months_changed(collection.database, [doc["created_at"] for doc in docs])
+            checkpoint.finished(last_line, stats)
+        finally:
+            semaphore.release()
+
+    def submit(docs: List[Dict], last_line: int):
+        checkpoint.started(last_line)
+        task = asyncio.create_task(run_batch(docs, last_line))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    try:
+        batch: List[Dict] = []
+        last_line = checkpoint.line
+        for line_no, raw in records:
+            stats.read += 1
+            last_line = line_no
+            try:
+                doc = to_document(raw)
+            except ValidationError as e:
+                stats.invalid += 1
+                if rejects:
+                    rejects.write(json.dumps({"line": line_no, "errors": e.errors(include_url=False)}, default=str) + "\n")
+                continue
+            doc["_id"] = import_id(source_key, line_no)
+            batch.append(doc)
+
+            if len(batch) >= batch_size:
+                await semaphore.acquire()
+                submit(batch, last_line)
+                batch = []
+                # Surface a batch that failed for good instead of reading on
+                for task in [task for task in tasks if task.done()]:
+                    task.result()
+
+            if time.monotonic() - last_report >= report_every:
+                print(stats.as_dict())
+                last_report = time.monotonic()
+
+        if batch:
+            await semaphore.acquire()
+            submit(batch, last_line)
+        if tasks:
+            await asyncio.gather(*tasks)
+        # Trailing invalid records advance the mark too
+        checkpoint.started(last_line)
+        checkpoint.finished(last_line, stats)
+    finally:
+        checkpoint.save(stats)
+        if rejects:
+            rejects.close()
+    return stats
+
+
+def write_ndjson(records: Iterator[Tuple[int, object]], output: str) -> int:
+    written = 0
+    with open(output, "w") as f:
+        for _, record in records:
+            f.write(json.dumps(record, default=lambda value: value.isoformat()) + "\n")
+            written += 1
+    return written
+
+
+async def _main(args):
+    if args.command == "import":
+        source_key = args.source_id or source_key_for(args.path)
+        file_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+        checkpoint_path = args.checkpoint or f"{args.path}.checkpoint.json"
+    else:
+        source_key = f"synthetic:{args.seed}:{args.homeowners}:{args.areas}:{args.days}"
+        checkpoint_path = args.checkpoint
+
+    if args.command == "synthetic" and args.output:
+        records = synthetic_requests(args.requests, args.homeowners, args.areas, args.days, args.seed)
+        start = time.monotonic()
+        written = write_ndjson(records, args.output)
+        print({"written": written, "output": args.output, "seconds": round(time.monotonic() - start, 1)})
+        return
+
+    if args.restart and checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = Checkpoint.load(checkpoint_path, source_key)
+    if checkpoint.line:
+        print(f"Resuming {source_key} after line {checkpoint.line}")
+
+    if args.command == "import":
+        reader = read_csv if file_format == "csv" else read_ndjson
+        records = reader(args.path, checkpoint.line)
+    else:
+        records = synthetic_requests(args.requests, args.homeowners, args.areas, args.days, args.seed,
+                                     skip_through=checkpoint.line)
+
+    await connect_to_mongo()
+    try:
+        stats = await load(
+            get_db()["requests"], records, source_key, checkpoint,
+            batch_size=args.batch_size, concurrency=args.concurrency,
+            report_every=args.report_every, rejects_path=getattr(args, "rejects", None),
+        )
+        print({"done": True, **stats.as_dict()})
+        print("Imported months are queued for the next request_stats refresh "
+              "(in the app, or: python -m app.services.rollups)")
+    finally:
+        await close_mongo_connection()
+    if stats.conflicts:
+        raise SystemExit(f"{stats.conflicts} records collided with different existing requests and were not imported")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Bulk load maintenance requests.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--batch-size", type=int, default=1000, help="documents per insert_many")
+    common.add_argument("--concurrency", type=int, default=4, help="insert_many batches in flight")
+    common.add_argument("--report-every", type=float, default=5.0, help="seconds between progress reports")
+    common.add_argument("--restart", action="store_true", help="ignore any existing checkpoint")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", parents=[common], help="import an NDJSON or CSV file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=["ndjson", "csv"], help="defaults to the file extension")
+    import_parser.add_argument("--checkpoint", help="defaults to <path>.checkpoint.json")
+    import_parser.add_argument("--source-id", help="stable name for this data set, instead of its path and content hash")
+    import_parser.add_argument("--rejects", help="append invalid records' validation errors to this file")
+
+    synthetic_parser = commands.add_parser("synthetic", parents=[common], help="generate synthetic requests")
+    synthetic_parser.add_argument("--requests", type=int, default=100_000)
+    synthetic_parser.add_argument("--homeowners", type=int, default=10_000)
+    synthetic_parser.add_argument("--areas", type=int, default=50, help="number of service areas")
+    synthetic_parser.add_argument("--days", type=int, default=730, help="spread creation dates over this many days")
+    synthetic_parser.add_argument("--seed", type=int, default=42)
+    synthetic_parser.add_argument("--output", help="write NDJSON here instead of inserting")
+    synthetic_parser.add_argument("--checkpoint", help="checkpoint file for resumable generation")
+    return parser
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(build_parser().parse_args()))
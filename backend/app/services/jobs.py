@@ -0,0 +1,333 @@
+# backend/app/services/jobs.py
+"""
+Durable background jobs stored in the `jobs` collection.
+
+Handlers enqueue a job with `enqueue_job`, or leave an outbox marker on the
+document they write (see `sweep_notify_outbox`), and return; a pool of asyncio
+workers claims due jobs atomically with `find_one_and_update`, runs the
+registered handler and retries failures with exponential backoff. A running
+job's lock is renewed while its handler works; a job whose worker died is
+reclaimed once the lock expires, until it runs out of attempts.
+
+The pool runs inside the app (JOB_WORKERS_IN_APP) or on its own:
+    python -m app.services.jobs [--workers N]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.leases import acquire_lease
+from app.db.mongodb import close_mongo_connection, connect_to_mongo, get_db
+from app.services.notifications import NOTIFY_PENDING, notify_contractors
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "jobs"
+OUTBOX_LEASE = "notify_outbox"
+
+# Job type -> async handler(db, payload)
+HANDLERS: Dict[str, Callable[..., Awaitable[None]]] = {
+    "notify_contractors": notify_contractors,
+}
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+def job_document(job_type: str, payload: Dict, delay_seconds: float = 0,
+                 max_attempts: Optional[int] = None) -> Dict:
+    if job_type not in HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+    now = datetime.utcnow()
+    return {
+        "type": job_type,
+        "payload": payload,
+        "status": JobStatus.QUEUED,
+        "attempts": 0,
+        "max_attempts": max_attempts or settings.JOB_MAX_ATTEMPTS,
+        "run_at": now + timedelta(seconds=delay_seconds),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+async def enqueue_job(db, job_type: str, payload: Dict, delay_seconds: float = 0,
+                      max_attempts: Optional[int] = None):
+    """Stores a job for the worker pool and returns its id."""
+    result = await db[JOBS_COLLECTION].insert_one(job_document(job_type, payload, delay_seconds, max_attempts))
+    logger.debug(f"Enqueued {job_type} job {result.inserted_id}")
+    return result.inserted_id
+
+
+async def sweep_notify_outbox(db, limit: int) -> int:
+    """
+    Turns up to `limit` `notify_pending` markers on requests into
+    notify_contractors jobs and clears them. A crash in between only
+    duplicates jobs, which the idempotent handler tolerates.
+    """
+    pending = await db["requests"].find({NOTIFY_PENDING: True}, {"_id": 1}) \
+        .sort("created_at", 1).limit(limit).to_list(length=limit)
+    if not pending:
+        return 0
+    ids = [doc["_id"] for doc in pending]
+    await db[JOBS_COLLECTION].insert_many(
+        [job_document("notify_contractors", {"request_id": str(request_id)}) for request_id in ids]
+    )
+    await db["requests"].update_many(
+        {"_id": {"$in": ids}, NOTIFY_PENDING: True},
+        {"$unset": {NOTIFY_PENDING: ""}},
+    )
+    logger.debug(f"Enqueued {len(ids)} notify_contractors jobs from the outbox")
+    return len(ids)
+
+
+def backoff_seconds(attempts: int) -> float:
+    return min(
+        settings.JOB_BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)),
+        settings.JOB_BACKOFF_MAX_SECONDS,
+    )
+
+
+async def queue_depth(db) -> Dict[str, int]:
+    """Number of jobs waiting to run and currently running."""
+    return {
+        "queued": await db[JOBS_COLLECTION].count_documents({"status": JobStatus.QUEUED}),
+        "running": await db[JOBS_COLLECTION].count_documents({"status": JobStatus.RUNNING}),
+    }
+
+
+class JobWorkerPool:
+    """A fixed number of asyncio workers polling the `jobs` collection."""
+
+    def __init__(self, db, workers: int):
+        self.db = db
+        self.workers = workers
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        self.outbox_enqueued = 0
+        self._started_at: Optional[float] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        self._started_at = time.monotonic()
+        self._tasks = [
+            asyncio.create_task(self._run_worker(f"{self.worker_prefix}:{i}"))
+            for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._run_housekeeping()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def metrics(self) -> Dict:
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "outbox_enqueued": self.outbox_enqueued,
+            "throughput_per_second": round(self.processed / elapsed, 3) if elapsed else 0.0,
+            "queue_depth": await queue_depth(self.db),
+        }
+
+    async def claim(self, worker_id: str) -> Optional[Dict]:
+        now = datetime.utcnow()
+        return await self.db[JOBS_COLLECTION].find_one_and_update(
+            {"$or": [
+                {"status": JobStatus.QUEUED, "run_at": {"$lte": now}},
+                # The worker holding this job stopped before finishing it
+                {
+                    "status": JobStatus.RUNNING,
+                    "locked_until": {"$lt": now},
+                    "$expr": {"$lt": ["$attempts", "$max_attempts"]},
+                },
+            ]},
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING,
+                    "locked_by": worker_id,
+                    "locked_until": now + timedelta(seconds=settings.JOB_LOCK_SECONDS),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def fail_abandoned(self) -> int:
+        """Fails jobs whose lock expired on their last allowed attempt, e.g. ones that keep crashing workers."""
+        now = datetime.utcnow()
+        result = await self.db[JOBS_COLLECTION].update_many(
+            {
+                "status": JobStatus.RUNNING,
+                "locked_until": {"$lt": now},
+                "$expr": {"$gte": ["$attempts", "$max_attempts"]},
+            },
+            {
+                "$set": {
+                    "status": JobStatus.FAILED,
+                    "finished_at": now,
+                    "updated_at": now,
+                    "last_error": "Worker stopped or lock expired on the final attempt",
+                },
+                "$unset": {"locked_by": "", "locked_until": ""},
+            },
+        )
+        if result.modified_count:
+            logger.error(f"Failed {result.modified_count} jobs abandoned on their final attempt")
+            self.failed += result.modified_count
+        return result.modified_count
+
+    async def _keep_locked(self, job: Dict, worker_id: str):
+        # Without renewal a handler slower than JOB_LOCK_SECONDS would be run twice
+        while True:
+            await asyncio.sleep(settings.JOB_LOCK_SECONDS / 3)
+            try:
+                await self.db[JOBS_COLLECTION].update_one(
+                    {"_id": job["_id"], "locked_by": worker_id},
+                    {"$set": {"locked_until": datetime.utcnow() + timedelta(seconds=settings.JOB_LOCK_SECONDS)}},
+                )
+            except PyMongoError as e:
+                logger.error(f"Could not renew lock on job {job['_id']}: {e}")
+
+    async def _finish(self, job: Dict, worker_id: str, update: Dict):
+        update["updated_at"] = datetime.utcnow()
+        await self.db[JOBS_COLLECTION].update_one(
+            {"_id": job["_id"], "locked_by": worker_id},
+            {"$set": update, "$unset": {"locked_by": "", "locked_until": ""}},
+        )
+
+    async def run_job(self, job: Dict, worker_id: str):
+        handler = HANDLERS.get(job["type"])
+        lock_renewer = asyncio.create_task(self._keep_locked(job, worker_id))
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job type {job['type']}")
+            try:
+                await handler(self.db, job.get("payload", {}))
+            finally:
+                lock_renewer.cancel()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            attempts = job.get("attempts", 1)
+            if attempts < job.get("max_attempts", settings.JOB_MAX_ATTEMPTS):
+                delay = backoff_seconds(attempts)
+                logger.warning(f"Job {job['_id']} ({job['type']}) failed, retrying in {delay}s: {e}")
+                self.retried += 1
+                await self._finish(job, worker_id, {
+                    "status": JobStatus.QUEUED,
+                    "run_at": datetime.utcnow() + timedelta(seconds=delay),
+                    "last_error": str(e),
+                })
+            else:
+                logger.error(f"Job {job['_id']} ({job['type']}) failed after {attempts} attempts: {e}")
+                self.failed += 1
+                await self._finish(job, worker_id, {
+                    "status": JobStatus.FAILED,
+                    "finished_at": datetime.utcnow(),
+                    "last_error": str(e),
+                })
+            return
+
+        self.processed += 1
+        await self._finish(job, worker_id, {"status": JobStatus.DONE, "finished_at": datetime.utcnow()})
+
+    async def _run_housekeeping(self):
+        interval = settings.JOB_POLL_INTERVAL_SECONDS
+        while True:
+            try:
+                # One pool sweeps per interval; the rest would only duplicate jobs
+                if await acquire_lease(self.db, OUTBOX_LEASE, interval):
+                    self.outbox_enqueued += await sweep_notify_outbox(self.db, settings.JOB_OUTBOX_BATCH_SIZE)
+                    await self.fail_abandoned()
+            except PyMongoError as e:
+                logger.error(f"Job housekeeping failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def _run_worker(self, worker_id: str):
+        while True:
+            try:
+                job = await self.claim(worker_id)
+            except PyMongoError as e:
+                logger.error(f"Worker {worker_id} could not claim a job: {e}")
+                job = None
+            if job is None:
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+                continue
+            try:
+                await self.run_job(job, worker_id)
+            except PyMongoError as e:
+                # The lock expires and another worker picks the job up again
+                logger.error(f"Worker {worker_id} could not record job {job['_id']}: {e}")
+
+
+# Worker pool started with the app
+_pool: Optional[JobWorkerPool] = None
+
+
+def start_job_workers(db):
+    """Starts the in-app worker pool, if JOB_WORKERS_IN_APP is set."""
+    global _pool
+    if db is None or settings.JOB_WORKERS_IN_APP <= 0 or _pool is not None:
+        return
+    _pool = JobWorkerPool(db, settings.JOB_WORKERS_IN_APP)
+    _pool.start()
+
+
+async def stop_job_workers():
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
+
+
+async def get_job_metrics(db) -> Dict:
+    """Metrics of the in-app pool, or just the queue depth when jobs run elsewhere."""
+    if _pool is not None:
+        return await _pool.metrics()
+    return {"workers": 0, "queue_depth": await queue_depth(db)}
+
+
+async def _main(workers: int, report_every: float):
+    await connect_to_mongo()
+    pool = JobWorkerPool(get_db(), workers)
+    pool.start()
+    try:
+        while True:
+            await asyncio.sleep(report_every)
+            print(await pool.metrics())
+    finally:
+        await pool.stop()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background job workers.")
+    parser.add_argument("--workers", type=int, default=4, help="number of concurrent workers")
+    parser.add_argument("--report-every", type=float, default=30.0, help="seconds between metrics reports")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args.workers, args.report_every))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,47 @@
+# backend/app/services/notifications.py
+"""
+Contractor notifications for new maintenance requests.
+
+Runs as the `notify_contractors` background job. New requests are written
+with `notify_pending` set, in the same insert as the request itself; the job
+pool's outbox sweep turns those markers into jobs. Each new open request is
+then recorded in the `contractor_notifications` outbox, which delivery
+channels (email, push) read from.
+"""
+import logging
+from datetime import datetime
+from typing import Dict
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+# Set on a request document until its notify_contractors job exists
+NOTIFY_PENDING = "notify_pending"
+
+
+async def notify_contractors(db, payload: Dict):
+    request_id = ObjectId(payload["request_id"])
+    request_doc = await db["requests"].find_one(
+        {"_id": request_id},
+        {"title": 1, "category": 1, "service_area": 1, "status": 1},
+    )
+    if request_doc is None:
+        # Deleted before the job ran; nothing to announce
+        logger.debug(f"Skipping notification for missing request {request_id}")
+        return
+
+    # Upsert keeps a retried job from announcing the same request twice
+    await db["contractor_notifications"].update_one(
+        {"request_id": request_id},
+        {"$setOnInsert": {
+            "request_id": request_id,
+            "title": request_doc.get("title"),
+            "category": request_doc.get("category"),
+            "service_area": request_doc.get("service_area"),
+            "created_at": datetime.utcnow(),
+            "delivered": False,
+        }},
+        upsert=True,
+    )
+    logger.debug(f"Queued contractor notification for request {request_id}")
@@ -0,0 +1,234 @@
+# backend/app/services/rollups.py
+"""
+Pre-aggregated request counts for the city-official analytics API.
+
+`request_stats` holds one document per (month, service_area) bucket with the
+total and a per-status breakdown. Each refresh finds the months whose
+requests changed since the last `updated_at` watermark, recomputes just
+those months from `requests` and `requests_archive`, and `$merge`s the
+result, so analytics reads never aggregate over the transactional
+collection.
+
+Deletions leave no `updated_at` behind, so whoever deletes a request calls
+`mark_months_changed` and the next refresh recomputes that month too.
+
+Refreshes never overlap: the scheduler and the batch job both run under the
+`request_stats_run` lease. Run as a batch job from the backend directory:
+    python -m app.services.rollups [--full]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.leases import acquire_lease, held_lease
+from app.db.mongodb import close_mongo_connection, connect_to_mongo, get_db
+from app.models.maintenance import MaintenanceStatus
+from app.services.archival import ARCHIVE_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+STATS_COLLECTION = "request_stats"
+STATE_COLLECTION = "rollup_state"
+STATE_ID = "request_stats"
+# Held for the whole refresh: overlapping runs would delete each other's
+# freshly merged buckets as stale
+RUN_LEASE = "request_stats_run"
+RUN_LEASE_SECONDS = 60
+
+# Background scheduler task started with the app
+_scheduler_task: Optional[asyncio.Task] = None
+
+
+def next_month(value: datetime) -> datetime:
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def rollup_pipeline(months: Optional[List[datetime]], refreshed_at: datetime) -> List[Dict]:
+    """
+    Aggregation that rebuilds the buckets for `months` (all months when None)
+    and merges them into `request_stats`.
+    """
+    if months is None:
+        match = {"created_at": {"$type": "date"}}
+    else:
+        match = {"$or": [
+            {"created_at": {"$gte": month, "$lt": next_month(month)}} for month in months
+        ]}
+    pipeline = [
+        {"$match": match},
+        # Archived requests still count towards platform-wide statistics
+        {"$unionWith": {"coll": ARCHIVE_COLLECTION, "pipeline": [{"$match": match}]}},
+        # A batch mid-archival is in both collections (copied, not yet deleted); count it once
+        {"$group": {
+            "_id": "$_id",
+            "created_at": {"$first": "$created_at"},
+            "service_area": {"$first": "$service_area"},
+            "status": {"$first": "$status"},
+        }},
+        {"$group": {
+            "_id": {
+                "month": {"$dateTrunc": {"date": "$created_at", "unit": "month"}},
+                "service_area": {"$ifNull": ["$service_area", None]},
+                "status": {"$ifNull": ["$status", MaintenanceStatus.OPEN.value]},
+            },
+            "count": {"$sum": 1},
+        }},
+        {"$group": {
+            "_id": {"month": "$_id.month", "service_area": "$_id.service_area"},
+            "total": {"$sum": "$count"},
+            "statuses": {"$push": {"k": "$_id.status", "v": "$count"}},
+        }},
+        {"$project": {
+            "_id": 1,
+            "month": "$_id.month",
+            "service_area": "$_id.service_area",
+            "total": 1,
+            "by_status": {"$arrayToObject": "$statuses"},
+            "refreshed_at": {"$literal": refreshed_at},
+        }},
+        {"$merge": {
+            "into": STATS_COLLECTION,
+            "on": "_id",
+            "whenMatched": "replace",
+            "whenNotMatched": "insert",
+        }},
+    ]
+    return pipeline
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+async def mark_months_changed(db, dates: Iterable[Optional[datetime]], session=None):
+    """
+    Queues the months of `dates` (request `created_at` values) for the next
+    refresh, for changes `updated_at` cannot show, such as deletions.
+    """
+    months = sorted({month_start(value) for value in dates if isinstance(value, datetime)})
+    if not months:
+        return
+    await db[STATE_COLLECTION].update_one(
+        {"_id": STATE_ID},
+        {"$addToSet": {"dirty_months": {"$each": months}}},
+        upsert=True,
+        session=session,
+    )
+
+
+async def changed_months(db, since: datetime) -> List[datetime]:
+    """Months (by `created_at`) containing requests updated after `since`."""
+    cursor = db["requests"].aggregate([
+        {"$match": {"updated_at": {"$gt": since}}},
+        {"$group": {"_id": {"$dateTrunc": {"date": "$created_at", "unit": "month"}}}},
+    ])
+    return [doc["_id"] async for doc in cursor if doc["_id"] is not None]
+
+
+async def refresh_request_stats(db, full: bool = False) -> Dict:
+    """
+    Brings `request_stats` up to date. Incremental unless `full` is set or no
+    watermark has been recorded yet.
+    """
+    run_started = datetime.utcnow()
+    state = await db[STATE_COLLECTION].find_one({"_id": STATE_ID}) or {}
+    watermark = state.get("watermark")
+    dirty_months = state.get("dirty_months", [])
+
+    if full or watermark is None:
+        months = None
+        logger.debug("Rebuilding request_stats from scratch")
+    else:
+        since = watermark - timedelta(seconds=settings.ROLLUP_WATERMARK_OVERLAP_SECONDS)
+        months = sorted(set(await changed_months(db, since)) | set(dirty_months))
+        logger.debug(f"Months changed since {since}: {months}")
+
+    if months is None or months:
+        await db["requests"].aggregate(
+            rollup_pipeline(months, run_started), allowDiskUse=True
+        ).to_list(length=None)
+
+        # Buckets in the rebuilt range that produced no rows are now empty
+        stale_filter = {"refreshed_at": {"$lt": run_started}}
+        if months is not None:
+            stale_filter["month"] = {"$in": months}
+        await db[STATS_COLLECTION].delete_many(stale_filter)
+
+    duration = (datetime.utcnow() - run_started).total_seconds()
+    await db[STATE_COLLECTION].update_one(
+        {"_id": STATE_ID},
+        {
+            "$set": {"watermark": run_started, "last_run_at": run_started, "last_run_seconds": duration},
+            # Only the months read above; ones marked during this run wait for the next
+            "$pullAll": {"dirty_months": dirty_months},
+        },
+        upsert=True,
+    )
+    result = {
+        "full": months is None,
+        "months_refreshed": None if months is None else len(months),
+        "watermark": run_started,
+        "seconds": duration,
+    }
+    logger.info(f"request_stats refreshed: {result}")
+    return result
+
+
+async def _run_scheduler(db, interval: float):
+    while True:
+        try:
+            if await acquire_lease(db, STATE_ID, interval):
+                async with held_lease(db, RUN_LEASE, RUN_LEASE_SECONDS) as held:
+                    if held:
+                        await refresh_request_stats(db)
+                    else:
+                        logger.debug("Skipping scheduled refresh; another refresh is running")
+        except PyMongoError as e:
+            logger.error(f"request_stats refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def start_rollup_scheduler(db):
+    """Starts periodic refreshes inside the app, if an interval is configured."""
+    global _scheduler_task
+    interval = settings.ROLLUP_REFRESH_INTERVAL_SECONDS
+    if db is None or interval <= 0 or _scheduler_task is not None:
+        return
+    _scheduler_task = asyncio.create_task(_run_scheduler(db, interval))
+
+
+async def stop_rollup_scheduler():
+    global _scheduler_task
+    if _scheduler_task is not None:
+        _scheduler_task.cancel()
+        try:
+            await _scheduler_task
+        except asyncio.CancelledError:
+            pass
+        _scheduler_task = None
+
+
+async def _main(full: bool):
+    await connect_to_mongo()
+    try:
+        db = get_db()
+        while True:
+            async with held_lease(db, RUN_LEASE, RUN_LEASE_SECONDS) as held:
+                if held:
+                    print(await refresh_request_stats(db, full=full))
+                    break
+            print("Another request_stats refresh is running; waiting for it to finish")
+            await asyncio.sleep(5)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the request_stats analytics rollup.")
+    parser.add_argument("--full", action="store_true", help="rebuild every bucket instead of only changed months")
+    asyncio.run(_main(parser.parse_args().full))
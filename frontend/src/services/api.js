@@ -10,6 +10,26 @@ const apiClient = axios.create({
   baseURL: API_BASE_URL,
 });
 
+// The backend returns a consistency token after each write. Sending it back
+// makes follow-up reads (which may hit a database replica) include that write.
+const CONSISTENCY_HEADER = 'X-Consistency-Token';
+let consistencyToken = null;
+
+apiClient.interceptors.request.use((config) => {
+  if (consistencyToken) {
+    config.headers[CONSISTENCY_HEADER] = consistencyToken;
+  }
+  return config;
+});
+
+apiClient.interceptors.response.use((response) => {
+  const token = response.headers[CONSISTENCY_HEADER.toLowerCase()];
+  if (token) {
+    consistencyToken = token;
+  }
+  return response;
+});
+
 /**
  * Fetches all maintenance requests for the authenticated user.
  */